@@ -0,0 +1,376 @@
+import random
+from typing import List, Tuple, Union
+
+from org.virajshah.monopoly.core import BOARD_TABLES, JAIL_INDEX, ColoredProperty, MonopolyGame, Property
+from org.virajshah.monopoly.logger import DISABLED, Logger
+
+# Short names for the shared board tables (see core.BoardTables), indexed by tile (or set id)
+BOARD_SIZE: int = BOARD_TABLES.size
+PRICES: Tuple[int, ...] = BOARD_TABLES.prices
+RENTS: Tuple[Tuple[int, ...], ...] = BOARD_TABLES.rents
+HOUSE_COSTS: Tuple[int, ...] = BOARD_TABLES.house_costs
+SET_OF: Tuple[int, ...] = BOARD_TABLES.set_of
+SET_SIZES: Tuple[int, ...] = BOARD_TABLES.set_id_sizes
+PURCHASABLE: Tuple[bool, ...] = BOARD_TABLES.purchasable
+GO_TO_JAIL: Tuple[bool, ...] = BOARD_TABLES.go_to_jail
+PROPERTY_TILES: Tuple[int, ...] = BOARD_TABLES.property_tiles
+
+
+class CompactGame:
+    def __init__(self, **kwargs):
+        """
+        Initialize a game whose entire state lives in flat lists indexed by
+        player id or tile index. Plays by the same rules as MonopolyGame
+        (and consumes random numbers in the same order), but without
+        Tile/Player objects, turn history, logs or an investment tracker.
+
+        :param kwargs:
+            players=List[str]: names of players to initialize the game with
+            seed=int: The seed for the game's random number generator
+            rng=random.Random: The random number generator (overrides seed)
+            If neither is passed, the seed is drawn from the global random module.
+        """
+        self.seed: Union[int, None] = None
+        self.rng: random.Random
+
+        if "rng" in kwargs:
+            self.rng = kwargs["rng"]
+        else:
+            self.seed = kwargs["seed"] if "seed" in kwargs else random.getrandbits(64)
+            self.rng = random.Random(self.seed)
+
+        names: List[str] = kwargs["players"] if "players" in kwargs else []
+        count: int = len(names)
+
+        self.names: List[str] = list(names)
+        self.balances: List[int] = [1500] * count
+        self.positions: List[int] = [0] * count
+        self.prisoners: List[bool] = [False] * count
+        self.mortgage_to_build: List[bool] = []
+        self.quick_builder: List[bool] = []
+        self.insurance_rate: List[float] = []
+
+        self.owners: List[int] = [-1] * BOARD_SIZE  # Player id per tile (-1 = unowned)
+        self.houses: List[int] = [0] * BOARD_SIZE
+        self.mortgaged: int = 0  # Bitmask by tile index
+        self.acquired: List[int] = [0] * BOARD_SIZE  # Orders each player's properties by acquisition
+        self.acquisitions: int = 0
+
+        self.players: List[int] = list(range(count))  # Ids of the active players
+        self.bankrupted_players: List[int] = []
+        self.curr_player: int = -1
+        self.turn_number: int = 0
+
+        # Same draws, in the same order, as PlayerConfiguration
+        for _ in range(count):
+            self.mortgage_to_build.append(True if self.rng.randrange(0, 2) else False)
+            self.quick_builder.append(True if self.rng.randrange(0, 2) else False)
+            self.insurance_rate.append(self.rng.random() / 4)
+
+    def insurance_amount(self, player: int) -> int:
+        """
+        :param player: The id of the player
+        :return: The amount of money the player keeps as insurance
+        """
+        circulation: int = 0
+        for other in self.players:
+            circulation += self.balances[other]
+        return int(self.insurance_rate[player] * circulation)
+
+    def owned_properties(self, player: int) -> List[int]:
+        """
+        :param player: The id of the player
+        :return: The tiles owned by the player, in the order they were acquired
+        """
+        owners: List[int] = self.owners
+        return sorted([tile for tile in PROPERTY_TILES if owners[tile] == player], key=self.acquired.__getitem__)
+
+    def run_next_turn(self) -> None:
+        """
+        Run the turn of the next player
+
+        :return: None
+        """
+        if len(self.players) == 0:
+            return
+
+        self.curr_player += 1
+        if self.curr_player >= len(self.players):
+            self.curr_player = 0
+
+        player: int = self.players[self.curr_player]
+        self.turn_number += 1
+        dice_roll1: int = self.rng.randrange(1, 7)
+        dice_roll2: int = self.rng.randrange(1, 7)
+
+        if self.prisoners[player] and dice_roll1 != dice_roll2:
+            return
+
+        position: int = self.positions[player] + dice_roll1 + dice_roll2
+        if position >= BOARD_SIZE:
+            position -= BOARD_SIZE
+        self.positions[player] = position
+
+        if GO_TO_JAIL[position]:
+            self.positions[player] = JAIL_INDEX
+            return
+
+        if PURCHASABLE[position]:
+            self.player_landed_on_property(player, position, dice_roll1 + dice_roll2)
+
+        self.build_houses(player)
+
+        if self.balances[player] < 0:
+            self.force_mortgage(player, -self.balances[player])
+
+        if self.balances[player] < 0:
+            self.bankrupt(player)
+
+    def player_landed_on_property(self, player: int, tile: int, roll: int) -> None:
+        """
+        Purchase the property or pay rent on it
+
+        :param player: The id of the player
+        :param tile: The tile the player landed on
+        :param roll: The sum of both dice rolls
+        :return: None
+        """
+        owner: int = self.owners[tile]
+        if owner == -1 and self.balances[player] - PRICES[tile] >= self.insurance_amount(player):
+            self.owners[tile] = player
+            self.acquired[tile] = self.acquisitions
+            self.acquisitions += 1
+            self.balances[player] -= PRICES[tile]
+        elif owner != -1 and owner != player:
+            rent_due: int = RENTS[tile][self.houses[tile]]
+            self.balances[player] -= rent_due
+            self.balances[owner] += rent_due
+
+    def classify(self, player: int) -> List[List[int]]:
+        """
+        Sort a player's properties into classes A through F
+        (see PropertyManager.classify)
+
+        :param player: The id of the player
+        :return: [class A, class B, class C, class D, class E, class F]
+        """
+        houses: List[int] = self.houses
+        properties: List[int] = self.owned_properties(player)
+        owned: List[int] = [0] * len(SET_SIZES)
+        hotels: List[int] = [0] * len(SET_SIZES)
+        total_hotels: int = 0
+        unimproved: int = 0
+
+        for tile in properties:
+            owned[SET_OF[tile]] += 1
+            if houses[tile] == 5:
+                hotels[SET_OF[tile]] += 1
+                total_hotels += 1
+            elif houses[tile] == 0:
+                unimproved += 1
+
+        classes: List[List[int]] = [[], [], [], [], [], []]
+        all_hotels: bool = total_hotels == len(properties)
+        all_improved: bool = unimproved == 0
+
+        for tile in properties:
+            set_id: int = SET_OF[tile]
+            monopoly: bool = owned[set_id] == SET_SIZES[set_id]
+            if all_hotels and monopoly:
+                classes[0].append(tile)
+            elif hotels[set_id] > 0:
+                classes[1] += [tile] * hotels[set_id]
+            elif all_improved:
+                classes[2].append(tile)
+            elif monopoly:
+                classes[3].append(tile)
+            else:
+                # PropertyManager.attribute_completion() never reaches 0.5, so class E stays empty
+                classes[5].append(tile)
+        return classes
+
+    def build_houses(self, player: int) -> None:
+        """
+        Mortgage and build houses according to the player's configuration
+        (see MonopolyGame.build_houses)
+
+        :param player: The id of the player
+        :return: None
+        """
+        class_b, class_c, class_d, class_e, class_f = self.classify(player)[1:]
+        to_build: List[int]
+
+        if self.mortgage_to_build[player] and self.quick_builder[player]:
+            to_build = class_b + class_c + class_d
+            self.liquidate_all(class_e + class_f)
+        elif self.mortgage_to_build[player]:
+            to_build = class_b or class_c or class_d
+            self.liquidate_all(class_f if len(class_f) != 0 else class_e)
+        elif self.quick_builder[player]:
+            to_build = class_b + class_c + class_d
+        else:
+            to_build = class_b or class_c or class_d
+
+        houses: List[int] = self.houses
+        for tile in to_build:
+            house_cost: int = HOUSE_COSTS[tile]
+            insurance: int = self.insurance_amount(player)
+            while houses[tile] < 5 and self.balances[player] - house_cost > insurance:
+                houses[tile] += 1
+                self.balances[player] -= house_cost
+            self.distribute_houses(player, tile)
+
+    def distribute_houses(self, player: int, tile: int) -> None:
+        """
+        Even out the houses on the set which a tile belongs to
+        (see ColoredProperty.distribute_houses)
+
+        :param player: The id of the owner
+        :param tile: A tile in the set
+        :return: None
+        """
+        houses: List[int] = self.houses
+        members: List[int] = [member for member in self.owned_properties(player) if SET_OF[member] == SET_OF[tile]]
+
+        while True:
+            min_houses: int = 5
+            max_houses: int = 0
+            min_tile: int = -1
+            max_tile: int = -1
+
+            for member in members:
+                if houses[member] < min_houses:
+                    min_houses = houses[member]
+                    min_tile = member
+                if houses[member] > max_houses:
+                    max_houses = houses[member]
+                    max_tile = member
+
+            if max_houses - min_houses <= 1:
+                return
+            houses[min_tile] += 1
+            houses[max_tile] -= 1
+
+    def sell_houses_and_mortgage(self, tile: int) -> float:
+        """
+        Sell all houses on a tile and mortgage it
+
+        :param tile: The tile to mortgage
+        :return: The value of the mortgaged property (as counted by MortgageManager)
+        """
+        owner: int = self.owners[tile]
+        if self.houses[tile] > 0:
+            self.balances[owner] += int(0.5 * self.houses[tile] * HOUSE_COSTS[tile])
+            self.houses[tile] = 0
+        self.mortgaged |= 1 << tile
+        self.balances[owner] += int(0.5 * PRICES[tile])
+        return PRICES[tile] / 2
+
+    def liquidate_all(self, tiles: List[int]) -> None:
+        """
+        Mortgage every unmortgaged tile in a list
+
+        :param tiles: The tiles to mortgage
+        :return: None
+        """
+        for tile in tiles:
+            if not self.mortgaged >> tile & 1:
+                self.sell_houses_and_mortgage(tile)
+
+    def liquidate(self, tiles: List[int], threshold: int) -> float:
+        """
+        Mortgage tiles until a threshold has been liquidated
+
+        :param tiles: The tiles to mortgage
+        :param threshold: The amount at which to stop
+        :return: The value of liquidated properties
+        """
+        liquidated: float = 0
+        for tile in tiles:
+            if not self.mortgaged >> tile & 1:
+                liquidated += self.sell_houses_and_mortgage(tile)
+            if liquidated >= threshold:
+                return liquidated
+        return liquidated
+
+    def force_mortgage(self, player: int, threshold: int) -> None:
+        """
+        Mortgage properties from the least to the most valuable class
+        (see MortgageManager.force_mortgage)
+
+        :param player: The id of the player
+        :param threshold: The amount of money required from the mortgages
+        :return: None
+        """
+        if self.liquidate(self.classify(player)[5], threshold) < threshold:
+            for property_class in (4, 3, 2, 1, 0):
+                self.liquidate(self.classify(player)[property_class], threshold)
+
+    def bankrupt(self, player: int) -> None:
+        """
+        Release a player's properties and remove them from the game
+
+        :param player: The id of the player
+        :return: None
+        """
+        for tile in PROPERTY_TILES:
+            if self.owners[tile] == player:
+                self.owners[tile] = -1
+                self.mortgaged &= ~(1 << tile)
+        self.bankrupted_players.append(player)
+        self.players.remove(player)
+
+    def state(self) -> tuple:
+        """
+        :return: The active players (name, balance, position) and every
+            tile's (owner name, houses, mortgaged), comparable with game_state()
+        """
+        return (tuple([(self.names[player], self.balances[player], self.positions[player])
+                       for player in self.players]),
+                tuple([(self.names[self.owners[tile]] if self.owners[tile] != -1 else None, self.houses[tile],
+                        bool(self.mortgaged >> tile & 1)) for tile in range(BOARD_SIZE)]))
+
+
+def game_state(game: MonopolyGame) -> tuple:
+    """
+    :param game: A game played by the object engine
+    :return: The same state as CompactGame.state()
+    """
+    tiles: List[tuple] = []
+    for tile in game.board:
+        if isinstance(tile, Property):
+            tiles.append((tile.owner.name if tile.owner is not None else None,
+                          tile.houses if isinstance(tile, ColoredProperty) else 0, tile.mortgaged))
+        else:
+            tiles.append((None, 0, False))
+    return tuple([(player.name, player.balance, player.position) for player in game.players]), tuple(tiles)
+
+
+def cross_check(seed: int, **kwargs) -> Union[int, None]:
+    """
+    Play the same seeded game with MonopolyGame and CompactGame and compare
+    their states after every turn.
+
+    :param seed: The seed for the game
+    :param kwargs:
+        players=List[str]: names of the players (default: 4 players)
+        max_turns=int: The number of turns to compare (default 1000)
+    :return: The first turn at which the engines disagree, or None if they agree
+    """
+    players: List[str] = kwargs["players"] if "players" in kwargs else ["Player 1", "Player 2", "Player 3",
+                                                                        "Player 4"]
+    max_turns: int = kwargs["max_turns"] if "max_turns" in kwargs else 1000
+
+    game: MonopolyGame = MonopolyGame(players=players, seed=seed, logger=Logger(level=DISABLED))
+    expected: List[tuple] = []
+    while len(game.players) > 1 and game.turn_number < max_turns:
+        game.run_next_turn()
+        expected.append(game_state(game))
+
+    compact: CompactGame = CompactGame(players=players, seed=seed)
+    while len(compact.players) > 1 and compact.turn_number < max_turns:
+        compact.run_next_turn()
+        if compact.turn_number > len(expected) or compact.state() != expected[compact.turn_number - 1]:
+            return compact.turn_number
+
+    return None if compact.turn_number == len(expected) else compact.turn_number + 1
@@ -1,10 +1,13 @@
 from abc import ABC, abstractmethod
+from collections import deque
 from enum import Enum
-from typing import List, Union, cast
+from types import MappingProxyType
+from typing import Callable, Deque, Dict, FrozenSet, List, Mapping, Tuple, Union, cast
 
-from org.virajshah.monopoly.logger import Logger
-from org.virajshah.monopoly.records import TurnHistoryRecord
-from random import randrange
+from org.virajshah.monopoly.eventlog import TurnRecorder
+from org.virajshah.monopoly.logger import DISABLED, Logger
+from org.virajshah.monopoly.records import EconomySnapshot, GameOutcome, GameSnapshot, InvestmentRecord, \
+    PlayerStatistics, TurnHistoryRecord
 import random
 
 from org.virajshah.monopoly.tracker import InvestmentTracker
@@ -19,19 +22,52 @@ class MonopolyGame:
 
         :param kwargs:
             players=List[str]: names of players to initialize the game with
-        """
+            logger=Logger: the logger to record the game to (default: a new Logger)
+            seed=int: The seed for the game's random number generator
+            rng=random.Random: The random number generator (overrides seed)
+            If neither is passed, the seed is drawn from the global random module.
+            recorder=TurnRecorder: Record every turn to a columnar event log (default: not recorded)
+            game_id=int: The identifier of the game in recorded events (default 0)
+            max_turns=int: End the game after this many turns (default: no limit)
+            stalemate_window=int: End the game once this many consecutive turns pass without any
+                balance or property changing hands, e.g. when every player is stuck in jail
+                (default: never)
+            history_length=int: Keep only each player's last history_length turns in Player.turn_history
+                (default: every turn). With 0 only Player.statistics is kept, so a game's memory does not
+                grow with its length.
+        """
+        self.seed: Union[int, None] = None
+        self.rng: random.Random
+
+        if "rng" in kwargs:
+            self.rng = kwargs["rng"]
+        else:
+            self.seed = kwargs["seed"] if "seed" in kwargs else random.getrandbits(64)
+            self.rng = random.Random(self.seed)
+
         self.board: List[Tile] = build_board()  # Tile[]
+        self.tables: BoardTables = BOARD_TABLES
         self.players: List[Player] = []
         self.bankrupted_players: List[Player] = []
+        self.circulation: int = 0  # The sum of the active players' balances
         self.curr_player: int = -1
         self.turn_number: int = 0
         self.investment_tracker: InvestmentTracker = InvestmentTracker()
+        self.logger: Logger = kwargs["logger"] if "logger" in kwargs else Logger()
+        self.recorder: Union[TurnRecorder, None] = kwargs["recorder"] if "recorder" in kwargs else None
+        self.game_id: int = kwargs["game_id"] if "game_id" in kwargs else 0
+        self.max_turns: Union[int, None] = kwargs["max_turns"] if "max_turns" in kwargs else None
+        self.stalemate_window: Union[int, None] = kwargs["stalemate_window"] if "stalemate_window" in kwargs \
+            else None
+        self.last_change_turn: int = 0  # The last turn in which a balance or property changed
+        self.outcome: Union[GameOutcome, None] = None  # Set once the game is over
+        self.history_length: Union[int, None] = kwargs["history_length"] if "history_length" in kwargs else None
 
         # Check if argument players=List[str] was passed
         # Then create players + add to game with provided names
         if "players" in kwargs:
             for player in kwargs["players"]:
-                self.players.append(Player(player, self))
+                self.add_player(Player(player, self))
 
     def add_player(self, player: "Player") -> None:
         """
@@ -41,17 +77,233 @@ class MonopolyGame:
         :return: None
         """
         self.players.append(player)
+        player.in_game = True
+        self.circulation += player.balance
+
+    def remove_player(self, player: "Player") -> None:
+        """
+        Remove a player from the list of current active players
+
+        :param player: The player to remove
+        :return: None
+        """
+        self.players.remove(player)
+        player.in_game = False
+        self.circulation -= player.balance
+
+    def snapshot(self) -> GameSnapshot:
+        """
+        Capture the state needed to continue the game: balances, positions,
+        jail flags, configurations, ownership, houses, mortgages and the
+        random number generator. Logs, turn histories, statistics and the
+        investment ledger are not captured.
+
+        :return: The snapshot
+        """
+        everyone: List[Player] = sorted(self.players + self.bankrupted_players, key=lambda player: player.seat)
+        snapshot: GameSnapshot = GameSnapshot()
+        snapshot.turn_number = self.turn_number
+        snapshot.curr_player = self.curr_player
+        snapshot.last_change_turn = self.last_change_turn
+        snapshot.rng_state = self.rng.getstate()
+        snapshot.names = tuple([player.name for player in everyone])
+        snapshot.balances = tuple([player.balance for player in everyone])
+        snapshot.positions = tuple([player.position for player in everyone])
+        snapshot.prisoners = tuple([player.prisoner for player in everyone])
+        snapshot.configurations = tuple([player.configuration.state() for player in everyone])
+        snapshot.properties = tuple([tuple([prop.index for prop in player.properties]) for player in everyone])
+        snapshot.active = tuple([player.seat for player in self.players])
+        snapshot.bankrupted = tuple([player.seat for player in self.bankrupted_players])
+
+        # Houses stay on the tiles released by bankrupt players, so every tile is captured
+        houses: List[int] = [tile.houses if isinstance(tile, ColoredProperty) else 0 for tile in self.board]
+        purchased: List[int] = [0] * len(self.board)
+        for player in self.players:
+            for prop in player.properties:
+                if prop.mortgaged:
+                    snapshot.mortgaged |= 1 << prop.index
+                record: Union[InvestmentRecord, None] = self.investment_tracker.find_active(prop.name)
+                purchased[prop.index] = record.purchased_turn if record is not None else self.turn_number
+        snapshot.houses = tuple(houses)
+        snapshot.purchased = tuple(purchased)
+        return snapshot
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        """
+        Return the game to a snapshot. The game must have been created from
+        the same snapshot (or have the same players). Logs are kept, while
+        turn histories, statistics and the investment ledger start over.
+
+        :param snapshot: A snapshot taken by snapshot()
+        :return: None
+        """
+        everyone: List[Player] = sorted(self.players + self.bankrupted_players, key=lambda player: player.seat)
+        for tile in self.board:
+            if isinstance(tile, Property):
+                tile.owner = None
+                tile._mortgaged = bool(snapshot.mortgaged >> tile.index & 1)
+                if isinstance(tile, ColoredProperty):
+                    tile._houses = snapshot.houses[tile.index]
+
+        self.investment_tracker = InvestmentTracker()
+        for player in everyone:
+            player.in_game = False
+            player.balance = snapshot.balances[player.seat]
+            player.position = snapshot.positions[player.seat]
+            player.prisoner = snapshot.prisoners[player.seat]
+            player.configuration.restore(snapshot.configurations[player.seat])
+            player.turn_history.clear()
+            player.statistics = PlayerStatistics(len(self.board))
+            player.properties.clear()
+            player.set_index.clear()
+            for index in snapshot.properties[player.seat]:
+                prop: Property = cast(Property, self.board[index])
+                prop.owner = player
+                player.properties.append(prop)
+                player.set_index.add(prop)
+                self.investment_tracker.track_property(prop.name, player.name, snapshot.purchased[index], prop.price)
+
+        self.players = [everyone[seat] for seat in snapshot.active]
+        self.bankrupted_players = [everyone[seat] for seat in snapshot.bankrupted]
+        for player in self.players:
+            player.in_game = True
+        self.circulation = sum([player.balance for player in self.players])
+        self.turn_number = snapshot.turn_number
+        self.curr_player = snapshot.curr_player
+        self.last_change_turn = snapshot.last_change_turn
+        self.outcome = None
+        self.rng.setstate(snapshot.rng_state)
+
+    @staticmethod
+    def from_snapshot(snapshot: GameSnapshot, **kwargs) -> "MonopolyGame":
+        """
+        Create a new game in the state of a snapshot
+
+        :param snapshot: A snapshot taken by snapshot()
+        :param kwargs: Passed on to MonopolyGame() (players are taken from the
+            snapshot). If seed or rng is passed, the game draws from that
+            instead of continuing the snapshot's random numbers.
+        :return: The game
+        """
+        # The game is built on a private generator (restore() sets its state), so that neither the global random
+        # module nor a generator passed in is drawn from for a seed or for configurations which restore() replaces
+        options: dict = {key: value for key, value in kwargs.items() if key not in ("players", "seed", "rng")}
+        game: MonopolyGame = MonopolyGame(rng=random.Random(0), **options)
+        for seat, name in enumerate(snapshot.names):
+            game.add_player(Player(name, game, PlayerConfiguration(state=snapshot.configurations[seat])))
+        game.restore(snapshot)
+        if "rng" in kwargs:
+            game.rng = kwargs["rng"]
+        elif "seed" in kwargs:
+            game.seed = kwargs["seed"]
+            game.rng = random.Random(game.seed)
+        return game
+
+    def fork(self, count: int, **kwargs) -> List["MonopolyGame"]:
+        """
+        Create copies of the game which can be played independently of it
+        (and of each other), e.g. for rollouts
+
+        :param count: The number of copies
+        :param kwargs:
+            seed=int: Give every copy its own random numbers, derived from this seed
+                (default: every copy continues this game's random numbers)
+            Anything else is passed on to MonopolyGame(). By default copies keep this game's max_turns,
+            stalemate_window and history_length, and each copy gets its own logger which logs nothing.
+        :return: The copies
+        """
+        snapshot: GameSnapshot = self.snapshot()
+        options: dict = {"max_turns": self.max_turns, "stalemate_window": self.stalemate_window,
+                         "history_length": self.history_length}
+        options.update({key: value for key, value in kwargs.items() if key != "seed"})
+        seeds: List[Union[int, None]] = spawn_seeds(kwargs["seed"], count) if "seed" in kwargs else [None] * count
+
+        forks: List[MonopolyGame] = []
+        for seed in seeds:
+            fork_options: dict = dict(options)
+            if "logger" not in fork_options:
+                fork_options["logger"] = Logger(level=DISABLED)
+            if seed is not None:
+                fork_options["seed"] = seed
+            forks.append(MonopolyGame.from_snapshot(snapshot, **fork_options))
+        return forks
+
+    def economy(self) -> EconomySnapshot:
+        """
+        :return: The cash, mortgaged property value and buildings in the game
+        """
+        snapshot: EconomySnapshot = EconomySnapshot()
+        snapshot.turn_number = self.turn_number
+        snapshot.players = len(self.players)
+        snapshot.cash = self.circulation
+        for tile in self.board:
+            if isinstance(tile, Property) and tile.owner is not None:
+                snapshot.owned_properties += 1
+                if tile.mortgaged:
+                    snapshot.mortgaged_properties += 1
+                    snapshot.mortgaged_value += int(0.5 * tile.price)
+                if isinstance(tile, ColoredProperty):
+                    snapshot.houses += tile.houses if tile.houses < 5 else 0
+                    snapshot.hotels += 1 if tile.houses == 5 else 0
+        return snapshot
+
+    @property
+    def finished(self) -> bool:
+        """
+        :return: True once the game is over (see outcome)
+        """
+        return self.outcome is not None
+
+    def play(self) -> GameOutcome:
+        """
+        Run turns until the game is over
+
+        :return: The outcome of the game
+        """
+        while self.outcome is None:
+            self.run_next_turn()
+        return self.outcome
+
+    def end(self, reason: str) -> GameOutcome:
+        """
+        End the game, ranking every player by net worth. Active players
+        rank above bankrupted players, who are ranked by how long they lasted.
+
+        :param reason: WINNER, MAX_TURNS or STALEMATE
+        :return: The outcome of the game
+        """
+        outcome: GameOutcome = GameOutcome()
+        outcome.reason = reason
+        outcome.turn_number = self.turn_number
+        if reason == "WINNER" and len(self.players) == 1:
+            outcome.winner = self.players[0].name
+        outcome.ranking = [(player.name, player.net_worth()) for player in
+                           sorted(self.players, key=lambda player: -player.net_worth())]
+        outcome.ranking += [(player.name, player.balance) for player in reversed(self.bankrupted_players)]
+        self.outcome = outcome
+        self.logger.log("The game is over after {} turns ({})", self.turn_number, reason)
+        return outcome
 
     @staticmethod
-    def build_houses(player: "Player"):
+    def build_houses(player: "Player", limit: Union[int, None] = None,
+                     priority: Union[Callable[["ColoredProperty"], float], None] = None):
+        """
+        Build houses on the player's properties (mortgaging others first if
+        the player's configuration allows it)
+
+        :param player: The player to build for
+        :param limit: The most houses to build in total (default: as many as the player can afford)
+        :param priority: Build first on the properties for which this is highest
+            (default: in the order of the property classes)
+        :return: None
+        """
+        if limit == 0:
+            return
+
         mortgage_manager: MortgageManager = MortgageManager(player)
         property_manager: PropertyManager = PropertyManager(player)
         to_build: PropertyList
-        class_b: PropertyList = property_manager.class_b_properties()
-        class_c: PropertyList = property_manager.class_c_properties()
-        class_d: PropertyList = property_manager.class_d_properties()
-        class_e: PropertyList = property_manager.class_e_properties()
-        class_f: PropertyList = property_manager.class_f_properties()
+        class_b, class_c, class_d, class_e, class_f = property_manager.classify()[1:]
 
         if player.configuration.mortgage_to_build and player.configuration.quick_builder:
             to_build = PropertyList(class_b + class_c + class_d)
@@ -64,29 +316,44 @@ class MonopolyGame:
         else:
             to_build: PropertyList = class_b or class_c or class_d
 
+        if priority is not None:
+            to_build = PropertyList(sorted(to_build, key=lambda prop: -priority(cast(ColoredProperty, prop))))
+
         for prop in to_build:
             assert isinstance(prop, ColoredProperty)
-            house_cost: int = prop.house_cost()
-            insurance: int = player.configuration.insurance_amount(player.game)
-            while prop.houses < 5 and player.balance - house_cost > insurance:
-                prop.houses += 1
-                player.add_money(-house_cost)
-            prop.distribute_houses()
+            budget: int = player.balance - player.configuration.insurance_amount(player.game)
+            if limit is None:
+                prop.build_houses(budget)
+            elif limit > 0:
+                # A budget of limit houses (plus the dollar build_houses keeps) builds at most limit houses
+                limit -= prop.build_houses(min(budget, limit * prop.house_cost() + 1))
 
     def player_landed_on_property(self, player: "Player", turn: TurnHistoryRecord):
         prop: Property = cast(Property, self.board[player.position])
 
-        if prop.owner is None and player.balance - prop.price >= player.configuration.insurance_amount(self):
-            prop.purchase(player)
+        if prop.owner is None and player.strategy.on_land_unowned(self, player, prop):
+            self.buy_property(player, prop)
             turn.new_properties.append(prop.name)
-            self.investment_tracker.track_property(prop.name, prop.owner.name, self.turn_number, prop.price)
-            Logger.log("{} purchased {} for ${}".format(player.name, prop.name, prop.price), type="transaction")
         elif prop.owner is not None and prop.owner != player:
             rent_due = prop.rent(roll=(turn.dice_roll1 + turn.dice_roll2))
             player.send_money(rent_due, prop.owner)
+            player.statistics.rent_paid += rent_due
+            prop.owner.statistics.rent_received += rent_due
             self.investment_tracker.rent_collected(prop.name, player.name, rent_due)
-            Logger.log("{} payed {} ${} for rent on {}".format(player, prop.owner, rent_due, prop),
-                       type="transaction")
+            self.logger.log("{} payed {} ${} for rent on {}", player, prop.owner, rent_due, prop,
+                            type="transaction")
+
+    def buy_property(self, player: "Player", prop: "Property") -> None:
+        """
+        Sell an unowned property to a player and start tracking the investment
+
+        :param player: The buyer
+        :param prop: The property
+        :return: None
+        """
+        prop.purchase(player)
+        self.investment_tracker.track_property(prop.name, player.name, self.turn_number, prop.price)
+        self.logger.log("{} purchased {} for ${}", player.name, prop.name, prop.price, type="transaction")
 
     def run_next_turn(self) -> None:
         """
@@ -96,7 +363,11 @@ class MonopolyGame:
         """
 
         if len(self.players) == 0:
-            Logger.log("There are no remaining players")
+            self.logger.log("There are no remaining players")
+            return
+
+        if self.outcome is not None:
+            self.logger.log("The game is already over")
             return
 
         self.curr_player += 1
@@ -108,94 +379,166 @@ class MonopolyGame:
         turn: TurnHistoryRecord = TurnHistoryRecord()
         self.turn_number += 1
 
+        statistics: PlayerStatistics = player.statistics
         player.turn_history.append(turn)
-        turn.turn_number = len(player.turn_history)
-        turn.dice_roll1 = randrange(1, 7)
-        turn.dice_roll2 = randrange(1, 7)
+        statistics.turns += 1
+        turn.turn_number = statistics.turns
+        turn.dice_roll1 = self.rng.randrange(1, 7)
+        turn.dice_roll2 = self.rng.randrange(1, 7)
+        if turn.dice_roll1 == turn.dice_roll2:
+            statistics.doubles += 1
         turn.origin = player.position
         turn.origin_in_jail = player.prisoner
         turn.initial_balance = player.balance
 
-        Logger.log(
-            "It is {}'s turn #{}. Starting at {}.".format(player.name, turn.turn_number, self.board[player.position]))
-        Logger.log(
-            "Dice Roll: {} and {} = {}".format(turn.dice_roll1, turn.dice_roll2, turn.dice_roll1 + turn.dice_roll2))
+        logger: Logger = self.logger
+        logger.log("It is {}'s turn #{}. Starting at {}.", player.name, turn.turn_number, self.board[player.position])
+        logger.log("Dice Roll: {} and {} = {}", turn.dice_roll1, turn.dice_roll2, turn.dice_roll1 + turn.dice_roll2)
 
         if player.prisoner and turn.dice_roll1 == turn.dice_roll2:
-            Logger.log(
-                "{} is in jail, but rolled doubles ({}), and is now out of jail.".format(player.name, turn.dice_roll1))
+            logger.log("{} is in jail, but rolled doubles ({}), and is now out of jail.", player.name, turn.dice_roll1)
         elif player.prisoner:
-            Logger.log(player.name + " is still stuck in jail (and didn't roll doubles).")
+            logger.log("{} is still stuck in jail (and didn't roll doubles).", player.name)
+            self.end_turn(player, turn)
             return
 
         player.position += turn.dice_roll1 + turn.dice_roll2
         if player.position > 39:
             player.position = player.position - 40
 
-        Logger.log("{} moved to {}".format(player.name, self.board[player.position].name))
+        statistics.landings[player.position] += 1
+        logger.log("{} moved to {}", player.name, self.board[player.position].name)
 
         if TileAttribute.GO_TO_JAIL in self.board[player.position].attributes:
             player.position = JAIL_INDEX
             turn.destination_in_jail = True
-            Logger.log(player.name + " is now in jail.")
+            statistics.jail_visits += 1
+            logger.log("{} is now in jail.", player.name)
+            self.end_turn(player, turn)
             return
 
         turn.destination_in_jail = False
         turn.destination = player.position
+        # Any change this turn is made by (or paid to or from) the current player
+        index_version: int = player.set_index.version
 
         if TileAttribute.PROPERTY in self.board[player.position].attributes:
             self.player_landed_on_property(player, turn)
 
         TradeBroker(player).attempt_all_trades()
 
-        MonopolyGame.build_houses(player)
+        player.strategy.on_build_phase(self, player)
 
         turn.recent_balance = player.balance
 
         if player.balance < 0:
-            MortgageManager(player).force_mortgage(-player.balance)
+            player.strategy.on_raise_cash(self, player, -player.balance)
 
         if player.balance < 0:
             for prop in player.properties:
                 prop.mortgaged = False
                 prop.owner = None
             player.properties.clear()
+            player.set_index.clear()
             self.bankrupted_players.append(player)
-            self.players.remove(player)
-            Logger.log("{} is now bankrupt (${}). Removing from the game.".format(player.name, player.balance),
+            self.remove_player(player)
+            logger.log("{} is now bankrupt (${}). Removing from the game.", player.name, player.balance,
                        type="bankrupted")
 
-        player.turn_history.append(turn)
+        if player.balance != turn.initial_balance or player.set_index.version != index_version or \
+                not player.in_game:
+            self.last_change_turn = self.turn_number
+
+        self.end_turn(player, turn)
         self.log_all_player_updates()
 
+    def end_turn(self, player: "Player", turn: TurnHistoryRecord) -> None:
+        """
+        Record a finished turn and end the game if it is over
+
+        :param player: The player whose turn it was
+        :param turn: The turn's history record
+        :return: None
+        """
+        self.record_turn(player, turn)
+
+        if len(self.players) <= 1:
+            self.end("WINNER")
+        elif self.max_turns is not None and self.turn_number >= self.max_turns:
+            self.end("MAX_TURNS")
+        elif self.stalemate_window is not None and self.turn_number - self.last_change_turn >= self.stalemate_window:
+            self.end("STALEMATE")
+
+    def record_turn(self, player: "Player", turn: TurnHistoryRecord) -> None:
+        """
+        Record a finished turn to the game's recorder (if it has one)
+
+        :param player: The player whose turn it was
+        :param turn: The turn's history record
+        :return: None
+        """
+        if self.recorder is not None:
+            self.recorder.record(self.game_id, self.turn_number, player.seat, turn, player.position, player.balance)
+
     def log_all_player_updates(self) -> None:
         """
-        Log the status of each active player to org.virajshah.monopoly.Logger
+        Log the status of each active player to the game's logger
 
         :return: None
         """
+        if not self.logger.enabled_for("player-update"):
+            return
+
         to_log = ""
         for p in self.players:
             to_log += "{} (${})\n{}\n{}\n".format(p.name, p.balance, "=" * len(p.name), str(p.properties))
-        Logger.log(to_log, type="player-update")
+        self.logger.log(to_log, type="player-update")
 
 
 class Player:
-    def __init__(self, name: str, game: MonopolyGame):
+    def __init__(self, name: str, game: MonopolyGame, configuration: Union["PlayerConfiguration", None] = None):
         """
         Initialize a monopoly player
 
         :param name: The player's name
         :param game: The game which the player is currently playing
+        :param configuration: The player's configuration (default: one drawn from the game's random numbers)
         """
         self.name: str = name
-        self.balance: int = 1500
+        self.seat: int = len(game.players) + len(game.bankrupted_players)  # Order in which the player joined
+        self.in_game: bool = False  # True while the player is one of game.players
+        self._balance: int = 1500
         self.position: int = 0
-        self.turn_history: List[TurnHistoryRecord] = []
+        # Bounded by MonopolyGame.history_length (every turn is counted in statistics)
+        self.turn_history: Deque[TurnHistoryRecord] = deque(maxlen=game.history_length)
+        self.statistics: PlayerStatistics = PlayerStatistics(len(game.board))
         self.properties: PropertyList = PropertyList([])
+        self.set_index: SetIndex = SetIndex()
+        self.property_classes: List[PropertyList] = []  # Cached by PropertyManager.classify()
+        self.property_classes_version: int = -1
         self.prisoner: bool = False
         self.game: MonopolyGame = game  # Game is assigned by MonopolyGame
-        self.configuration: PlayerConfiguration = PlayerConfiguration()
+        self.configuration: PlayerConfiguration = configuration if configuration is not None \
+            else PlayerConfiguration(game.rng)
+        self._strategy: Strategy = DEFAULT_STRATEGY
+
+    @property
+    def strategy(self) -> "Strategy":
+        """
+        :return: The strategy which makes the player's decisions
+        """
+        return self._strategy
+
+    @strategy.setter
+    def strategy(self, strategy: "Strategy") -> None:
+        """
+        Set the player's strategy, letting it precompile its decisions for the player's game
+
+        :param strategy: The new strategy
+        :return: None
+        """
+        self._strategy = strategy
+        strategy.compile(self.game, self)
 
     def send_money(self, amount: int, other_player: "Player") -> None:
         """
@@ -208,6 +551,37 @@ class Player:
         self.add_money(-amount)
         other_player.add_money(amount)
 
+    @property
+    def balance(self) -> int:
+        """
+        :return: The amount of money the player has
+        """
+        return self._balance
+
+    @balance.setter
+    def balance(self, balance: int) -> None:
+        """
+        Set the player's balance, keeping the game's circulation up to date
+
+        :param balance: The new balance
+        :return: None
+        """
+        if self.in_game:
+            self.game.circulation += balance - self._balance
+        self._balance = balance
+
+    def net_worth(self) -> int:
+        """
+        :return: The player's balance plus the value of their properties
+            (the mortgage value if mortgaged) and houses
+        """
+        worth: int = self.balance
+        for prop in self.properties:
+            worth += int(0.5 * prop.price) if prop.mortgaged else prop.price
+            if isinstance(prop, ColoredProperty):
+                worth += prop.houses * prop.house_cost()
+        return worth
+
     def add_money(self, amount: int) -> None:
         """
         Add money to player's (self) balance
@@ -235,14 +609,159 @@ class PropertyList(list):
         return out
 
 
-class PlayerConfiguration:
+class SetIndex:
     def __init__(self):
+        """
+        Statistics about a player's properties, grouped by the set
+        TileAttribute which each property belongs to. The index is
+        updated incrementally whenever a property changes hands,
+        is mortgaged or has houses built or sold.
+        """
+        self.members: Dict[Union[TileAttribute, None], PropertyList] = {}
+        self.houses: Dict[Union[TileAttribute, None], int] = {}
+        self.hotels: Dict[Union[TileAttribute, None], int] = {}
+        self.mortgaged: Dict[Union[TileAttribute, None], int] = {}
+        self.unimproved: int = 0  # Properties without any houses
+        self.total_hotels: int = 0
+        self.version: int = 0  # Incremented on every change
+
+    def owned(self, set_attr: Union["TileAttribute", None]) -> int:
+        """
+        :param set_attr: The set TileAttribute to query
+        :return: The number of properties owned in the set
+        """
+        members: Union[PropertyList, None] = self.members.get(set_attr)
+        return len(members) if members is not None else 0
+
+    def add(self, prop: "Property") -> None:
+        """
+        Add a newly acquired property to the index
+
+        :param prop: The property which was acquired
+        :return: None
+        """
+        set_attr: Union[TileAttribute, None] = prop.set_attribute
+        if set_attr not in self.members:
+            self.members[set_attr] = PropertyList([])
+            self.houses[set_attr] = 0
+            self.hotels[set_attr] = 0
+            self.mortgaged[set_attr] = 0
+
+        houses: int = prop.houses if isinstance(prop, ColoredProperty) else 0
+        self.members[set_attr].append(prop)
+        self.houses[set_attr] += houses
+        if houses == 5:
+            self.hotels[set_attr] += 1
+            self.total_hotels += 1
+        elif houses == 0:
+            self.unimproved += 1
+        if prop.mortgaged:
+            self.mortgaged[set_attr] += 1
+        self.version += 1
+
+    def remove(self, prop: "Property") -> None:
+        """
+        Remove a property which is no longer owned from the index
+
+        :param prop: The property which was lost
+        :return: None
+        """
+        set_attr: Union[TileAttribute, None] = prop.set_attribute
+        houses: int = prop.houses if isinstance(prop, ColoredProperty) else 0
+        self.members[set_attr].remove(prop)
+        self.houses[set_attr] -= houses
+        if houses == 5:
+            self.hotels[set_attr] -= 1
+            self.total_hotels -= 1
+        elif houses == 0:
+            self.unimproved -= 1
+        if prop.mortgaged:
+            self.mortgaged[set_attr] -= 1
+        self.version += 1
+
+    def update_houses(self, prop: "ColoredProperty", old: int, new: int) -> None:
+        """
+        Record a change in the number of houses on an owned property
+
+        :param prop: The property which was built on (or sold from)
+        :param old: The previous number of houses
+        :param new: The new number of houses
+        :return: None
+        """
+        set_attr: Union[TileAttribute, None] = prop.set_attribute
+        self.houses[set_attr] += new - old
+        if old == 5:
+            self.hotels[set_attr] -= 1
+            self.total_hotels -= 1
+        elif old == 0:
+            self.unimproved -= 1
+        if new == 5:
+            self.hotels[set_attr] += 1
+            self.total_hotels += 1
+        elif new == 0:
+            self.unimproved += 1
+        self.version += 1
+
+    def update_mortgaged(self, prop: "Property", mortgaged: bool) -> None:
+        """
+        Record a change in the mortgage status of an owned property
+
+        :param prop: The property which was mortgaged (or unmortgaged)
+        :param mortgaged: True if the property is now mortgaged
+        :return: None
+        """
+        self.mortgaged[prop.set_attribute] += 1 if mortgaged else -1
+        self.version += 1
+
+    def clear(self) -> None:
+        """
+        Remove all properties from the index
+
+        :return: None
+        """
+        self.members.clear()
+        self.houses.clear()
+        self.hotels.clear()
+        self.mortgaged.clear()
+        self.unimproved = 0
+        self.total_hotels = 0
+        self.version += 1
+
+
+class PlayerConfiguration:
+    def __init__(self, rng: Union[random.Random, None] = None, state: Union[tuple, None] = None):
         """
         Generate a random player configuration
+
+        :param rng: The random number generator to draw from
+            (default: one seeded from the global random module)
+        :param state: Settings returned by state() to use instead of random ones (nothing is drawn)
         """
-        self.mortgage_to_build: bool = True if randrange(0, 2) else False
-        self.quick_builder: bool = True if randrange(0, 2) else False
-        self.insurance_rate: float = random.random() / 4
+        self.mortgage_to_build: bool
+        self.quick_builder: bool
+        self.insurance_rate: float
+
+        if state is not None:
+            self.restore(state)
+        else:
+            if rng is None:
+                rng = random.Random(random.getrandbits(64))
+            self.mortgage_to_build = True if rng.randrange(0, 2) else False
+            self.quick_builder = True if rng.randrange(0, 2) else False
+            self.insurance_rate = rng.random() / 4
+
+    def state(self) -> tuple:
+        """
+        :return: The configuration's settings, as stored in a GameSnapshot
+        """
+        return self.mortgage_to_build, self.quick_builder, self.insurance_rate
+
+    def restore(self, state: tuple) -> None:
+        """
+        :param state: Settings returned by state()
+        :return: None
+        """
+        self.mortgage_to_build, self.quick_builder, self.insurance_rate = state
 
     def insurance_amount(self, game: MonopolyGame) -> int:
         """
@@ -252,10 +771,96 @@ class PlayerConfiguration:
         :param game: The wrapping game
         :return: The amount of insurance money
         """
-        circulation: int = 0
-        for player in game.players:
-            circulation += player.balance
-        return int(self.insurance_rate * circulation)
+        return int(self.insurance_rate * game.circulation)
+
+
+class Strategy(ABC):
+    """
+    The decisions a player makes during a game. The engine calls the hooks
+    of each player's strategy (Player.strategy) at the points where a
+    decision is needed. Strategies are not part of a GameSnapshot, so
+    snapshots, forks and rollouts play with DefaultStrategy.
+    """
+
+    def compile(self, game: MonopolyGame, player: "Player") -> None:
+        """
+        Called when the strategy is assigned to a player, to precompute
+        whatever the hooks need (e.g. lookup tables indexed by board index)
+
+        :param game: The player's game
+        :param player: The player
+        :return: None
+        """
+        pass
+
+    @abstractmethod
+    def on_land_unowned(self, game: MonopolyGame, player: "Player", prop: "Property") -> bool:
+        """
+        :param game: The game
+        :param player: The player who landed on the property
+        :param prop: The unowned property
+        :return: True to buy the property
+        """
+        pass
+
+    @abstractmethod
+    def on_build_phase(self, game: MonopolyGame, player: "Player") -> None:
+        """
+        Build houses (and mortgage properties to pay for them) after the player moves
+
+        :param game: The game
+        :param player: The player whose turn it is
+        :return: None
+        """
+        pass
+
+    @abstractmethod
+    def on_raise_cash(self, game: MonopolyGame, player: "Player", amount: int) -> None:
+        """
+        Sell houses and mortgage properties to cover a negative balance
+        (the player is bankrupt if their balance is still negative afterwards)
+
+        :param game: The game
+        :param player: The player who is in debt
+        :param amount: The amount of money needed
+        :return: None
+        """
+        pass
+
+    @abstractmethod
+    def on_trade_offer(self, game: MonopolyGame, player: "Player", receiving: "Property",
+                       giving: "Property") -> Union[bool, None]:
+        """
+        :param game: The game
+        :param player: The player being offered the trade
+        :param receiving: The property the player would receive
+        :param giving: The property the player would give away
+        :return: True to accept, False to refuse, or None to leave it to the
+            other player (a trade needs at least one acceptance)
+        """
+        pass
+
+
+class DefaultStrategy(Strategy):
+    """
+    The rule-based decisions configured by each player's PlayerConfiguration
+    """
+
+    def on_land_unowned(self, game: MonopolyGame, player: "Player", prop: "Property") -> bool:
+        return player.balance - prop.price >= player.configuration.insurance_amount(game)
+
+    def on_build_phase(self, game: MonopolyGame, player: "Player") -> None:
+        MonopolyGame.build_houses(player)
+
+    def on_raise_cash(self, game: MonopolyGame, player: "Player", amount: int) -> None:
+        MortgageManager(player).force_mortgage(amount)
+
+    def on_trade_offer(self, game: MonopolyGame, player: "Player", receiving: "Property",
+                       giving: "Property") -> Union[bool, None]:
+        return None
+
+
+DEFAULT_STRATEGY: DefaultStrategy = DefaultStrategy()  # Shared, since it keeps no state of its own
 
 
 class TileAttribute(Enum):
@@ -288,9 +893,19 @@ class TileAttribute(Enum):
         :return: True if the TileAttribute describes a set
             (color group or utility/railroad type
         """
-        return attr in [TileAttribute.SET1, TileAttribute.SET2, TileAttribute.SET3, TileAttribute.SET4,
-                        TileAttribute.SET5, TileAttribute.SET6, TileAttribute.SET7, TileAttribute.SET8,
-                        TileAttribute.RAILROAD, TileAttribute.UTILITY]
+        return attr in SET_ATTRIBUTES
+
+
+SET_ATTRIBUTES: FrozenSet[TileAttribute] = frozenset([
+    TileAttribute.SET1, TileAttribute.SET2, TileAttribute.SET3, TileAttribute.SET4,
+    TileAttribute.SET5, TileAttribute.SET6, TileAttribute.SET7, TileAttribute.SET8,
+    TileAttribute.RAILROAD, TileAttribute.UTILITY])
+
+HOUSE_COSTS: Dict[TileAttribute, int] = {
+    TileAttribute.SET1: 50, TileAttribute.SET2: 50,
+    TileAttribute.SET3: 100, TileAttribute.SET4: 100,
+    TileAttribute.SET5: 150, TileAttribute.SET6: 150,
+    TileAttribute.SET7: 200, TileAttribute.SET8: 200}
 
 
 class Tile(ABC):
@@ -304,6 +919,7 @@ class Tile(ABC):
             attribute=List[TileAttribute]: a list of attributes to add
         """
         self.name: str = name
+        self.index: int = -1  # Position on the board, assigned by build_board()
         self.attributes: List[TileAttribute] = []
 
         if "attribute" in kwargs:
@@ -345,7 +961,32 @@ class Property(Tile, ABC):
         super().__init__(name, **kwargs)
         self.price: int = price
         self.owner: Union[Player, None] = None  # Player
-        self.mortgaged: bool = False
+        self._mortgaged: bool = False
+        self.set_attribute: Union[TileAttribute, None] = None
+
+        for attr in self.attributes:
+            if attr in SET_ATTRIBUTES:
+                self.set_attribute = attr
+                break
+
+    @property
+    def mortgaged(self) -> bool:
+        """
+        :return: True if the property is mortgaged
+        """
+        return self._mortgaged
+
+    @mortgaged.setter
+    def mortgaged(self, mortgaged: bool) -> None:
+        """
+        Set the mortgage status, keeping the owner's SetIndex up to date
+
+        :param mortgaged: True if the property is now mortgaged
+        :return: None
+        """
+        if self.owner is not None and mortgaged != self._mortgaged:
+            self.owner.set_index.update_mortgaged(self, mortgaged)
+        self._mortgaged = mortgaged
 
     def get_set_attribute(self) -> Union[TileAttribute, None]:
         """
@@ -353,10 +994,7 @@ class Property(Tile, ABC):
         :return: The TileAttribute describing the properties set.
             Return value should be checked for None.
         """
-        for attr in self.attributes:
-            if TileAttribute.is_set_attribute(attr):
-                return attr
-        return None
+        return self.set_attribute
 
     def is_monopoly_completed(self) -> bool:
         """
@@ -371,21 +1009,8 @@ class Property(Tile, ABC):
             and the set which they belong to.
         """
         if self.owner is not None:
-            count: int = 0
-            set_attr: TileAttribute = self.get_set_attribute()
-
-            for prop in self.owner.properties:
-                if prop.get_set_attribute() == set_attr:
-                    count += 1
-
-            count: float = float(count)
-
-            if set_attr == TileAttribute.SET1 or set_attr == TileAttribute.SET8 or set_attr == TileAttribute.UTILITY:
-                return count / 2
-            elif set_attr == TileAttribute.RAILROAD:
-                return count / 4
-            else:
-                return count / 3
+            set_attr: TileAttribute = self.set_attribute
+            return float(self.owner.set_index.owned(set_attr)) / BOARD_TABLES.set_sizes.get(set_attr, 3)
         return 0
 
     def purchase(self, purchaser: Player) -> None:
@@ -401,6 +1026,7 @@ class Property(Tile, ABC):
         self.owner = purchaser
         purchaser.add_money(-self.price)
         purchaser.properties.append(self)
+        purchaser.set_index.add(self)
 
     def mortgage(self) -> None:
         """
@@ -430,8 +1056,10 @@ class Property(Tile, ABC):
         :return: None
         """
         self.owner.properties.remove(self)
+        self.owner.set_index.remove(self)
         self.owner = new_owner
         new_owner.properties.append(self)
+        new_owner.set_index.add(self)
 
     @abstractmethod
     def rent(self, **kwargs) -> int:
@@ -446,7 +1074,7 @@ class Property(Tile, ABC):
 
 
 class ColoredProperty(Property):
-    def __init__(self, name: str, price: int, rent_list: List[int], set_attribute: TileAttribute):
+    def __init__(self, name: str, price: int, rent_list: Tuple[int, ...], set_attribute: TileAttribute):
         """
         Initialize a colored property. These are properties
         with an assigned color. Does not include railroads
@@ -454,57 +1082,99 @@ class ColoredProperty(Property):
 
         :param name: The name of the property
         :param price: The cost to purchase the property from the bank
-        :param rent_list: The list of rent values per house (rent_list[5] = w/ hotel)
+        :param rent_list: The rent values per house (rent_list[5] = w/ hotel)
         :param set_attribute: The set which this property belongs to
         """
         super().__init__(name, price,
                          attributes=[TileAttribute.PROPERTY, set_attribute, TileAttribute.COLORED_PROPERTY])
-        self.rents: List[int] = rent_list
-        self.houses: int = 0
+        self.rents: Tuple[int, ...] = rent_list
+        self._houses: int = 0
+
+    @property
+    def houses(self) -> int:
+        """
+        :return: The number of houses on the property (5 = hotel)
+        """
+        return self._houses
+
+    @houses.setter
+    def houses(self, houses: int) -> None:
+        """
+        Set the number of houses, keeping the owner's SetIndex up to date
+
+        :param houses: The new number of houses (5 = hotel)
+        :return: None
+        """
+        if self.owner is not None and houses != self._houses:
+            self.owner.set_index.update_houses(self, self._houses, houses)
+        self._houses = houses
 
     def house_cost(self) -> int:
         """
         :return: The cost to build a single house on this property
         """
+        return HOUSE_COSTS[self.set_attribute]
 
-        set_attr: TileAttribute = self.get_set_attribute()  # TileAttribute
-        if set_attr == TileAttribute.SET1 or set_attr == TileAttribute.SET2:
-            return 50
-        elif set_attr == TileAttribute.SET3 or set_attr == TileAttribute.SET4:
-            return 100
-        elif set_attr == TileAttribute.SET5 or set_attr == TileAttribute.SET6:
-            return 150
-        elif set_attr == TileAttribute.SET7 or set_attr == TileAttribute.SET8:
-            return 200
+    def build_houses(self, budget: int) -> int:
+        """
+        Build as many houses as the owner can buy for less than a budget
+        (up to a hotel), pay for them, then distribute the houses on the set
+
+        :param budget: The owner's balance less the money they want to keep
+        :return: The number of houses built
+        """
+        house_cost: int = self.house_cost()
+        # Each house is bought only while the balance stays strictly above the money kept
+        built: int = min(5 - self.houses, max(0, (budget - 1) // house_cost))
+        if built > 0:
+            self.houses += built
+            self.owner.add_money(-built * house_cost)
+        self.distribute_houses()
+        return built
 
     def distribute_houses(self) -> None:
         """
         Distribute the number of houses on this set amongst all properties
-        on the same set
+        on the same set. Houses are moved, one at a time, from the first
+        property with the most houses to the first with the fewest, until
+        no two properties differ by more than one house. The moves are
+        worked out on plain counts and applied to the properties at the end.
+
+        This is not a closed form: every property ends with total // n or
+        total // n + 1 houses, but which properties get the extra houses
+        depends on the order of the moves (e.g. 0, 2, 2 becomes 1, 1, 2).
+        CompactGame and LockstepGames replay the same moves, so that all
+        engines build the same layouts. Sets have at most four properties,
+        so only a few moves are made.
 
         :return: None
         """
-        set_attr: TileAttribute = self.get_set_attribute()
-
-        min_houses: int = 5  # These values are reversed
-        max_houses: int = 0  # Think about why it makes sense
-        min_prop: Union[Property, None] = None
-        max_prop: Union[Property, None] = None
-
-        for prop in self.owner.properties:
+        members: PropertyList = self.owner.set_index.members[self.set_attribute]
+        houses: List[int] = [cast(ColoredProperty, prop).houses for prop in members]
+
+        while True:
+            min_houses: int = 5  # These values are reversed
+            max_houses: int = 0  # Think about why it makes sense
+            min_index: int = -1
+            max_index: int = -1
+
+            for index, count in enumerate(houses):
+                if count < min_houses:
+                    min_houses = count
+                    min_index = index
+                if count > max_houses:
+                    max_houses = count
+                    max_index = index
+
+            if max_houses - min_houses <= 1:
+                break
+            houses[min_index] += 1
+            houses[max_index] -= 1
+
+        for prop, count in zip(members, houses):
             assert isinstance(prop, ColoredProperty)
-            if prop.get_set_attribute() == set_attr:
-                if prop.houses < min_houses:
-                    min_houses = prop.houses
-                    min_prop = prop
-                if prop.houses > max_houses:
-                    max_houses = prop.houses
-                    max_prop = prop
-
-        if max_houses - min_houses > 1:
-            min_prop.houses += 1
-            max_prop.houses -= 1
-            self.distribute_houses()
+            if prop.houses != count:
+                prop.houses = count
 
     def rent(self, **kwargs) -> int:
         """
@@ -539,6 +1209,8 @@ class NonColoredProperty(Property):
         :param prop_type: Either TileAttribute.{RAILROAD or UTILITY}
         """
         super().__init__(name, 200 if prop_type == TileAttribute.RAILROAD else 150)
+        # Not one of the tile's attributes, so railroads and utilities are not grouped into sets in a SetIndex
+        self.prop_type: TileAttribute = prop_type
 
     def rent(self, **kwargs) -> int:
         """
@@ -550,16 +1222,10 @@ class NonColoredProperty(Property):
         """
 
         if TileAttribute.RAILROAD in self.attributes:
-            count: int = 0
-            for prop in self.owner.properties:
-                if prop.get_set_attribute() == TileAttribute.RAILROAD:
-                    count += 1
+            count: int = self.owner.set_index.owned(TileAttribute.RAILROAD)
             return (2 ** (count - 1)) * 25
         else:
-            count: int = 0
-            for prop in self.owner.properties:
-                if prop.get_set_attribute() == TileAttribute.UTILITY:
-                    count += 1
+            count: int = self.owner.set_index.owned(TileAttribute.UTILITY)
             return kwargs["roll"] * (10 if count == 2 else 4)
 
     def __str__(self):
@@ -670,96 +1336,86 @@ class PropertyManager:
         self.client: Player = client
 
     def attribute_completion(self, attr: TileAttribute) -> float:
-        total: float = 0.0
         count: float = 0.0
+        total: float = self.client.game.tables.attribute_counts.get(attr, 0) + self.client.set_index.owned(attr)
 
-        for tile in self.client.game.board:
-            if attr in tile.attributes:
-                total += 1
-
-        for prop in self.client.properties:
-            if attr in prop.attributes:
-                total += 1
         return count / total
 
+    def classify(self) -> List[PropertyList]:
+        """
+        Sort the client's properties into classes A through F in a single pass.
+        The result is cached on the client until its SetIndex changes (i.e. a
+        property is bought, traded, mortgaged or built on).
+
+        :return: [class A, class B, class C, class D, class E, class F].
+            The lists are shared with the cache and must not be modified.
+        """
+        client: Player = self.client
+        index: SetIndex = client.set_index
+        if client.property_classes_version == index.version:
+            return client.property_classes
+
+        properties: PropertyList = client.properties
+        classes: List[PropertyList] = [PropertyList([]) for _ in range(6)]
+        class_a, class_b, class_c, class_d, class_e, class_f = classes
+        all_hotels: bool = index.total_hotels == len(properties)
+        all_improved: bool = index.unimproved == 0
+
+        for prop in properties:
+            set_attr: Union[TileAttribute, None] = prop.set_attribute
+            if all_hotels and isinstance(prop, ColoredProperty) and prop.is_monopoly_completed():
+                class_a.append(prop)
+            elif index.hotels[set_attr] > 0:
+                # A property is listed once per hotel in its set
+                class_b += [prop] * index.hotels[set_attr]
+            elif all_improved:
+                class_c.append(prop)
+            elif prop.is_monopoly_completed():
+                class_d.append(prop)
+            elif self.attribute_completion(set_attr) >= 0.5:
+                class_e.append(prop)
+            else:
+                class_f.append(prop)
+
+        client.property_classes = classes
+        client.property_classes_version = index.version
+        return classes
+
     def class_a_properties(self) -> PropertyList:
         """
         :return: Colored properties in a monopoly set with a hotel on all properties in the set
         """
-        out: PropertyList = PropertyList([])
-        for prop in self.client.properties:
-            if isinstance(prop, ColoredProperty) and prop.is_monopoly_completed():
-                monopoly_set: PropertyList = PropertyList([prop for prop in self.client.properties if
-                                                           prop.get_set_attribute() in prop.attributes])
-                flag: bool = True
-                for set_prop in monopoly_set:
-                    if cast(ColoredProperty, set_prop).houses != 5:
-                        flag = False
-                if flag:
-                    out.append(prop)
-        return out
+        return PropertyList(self.classify()[0])
 
     def class_b_properties(self) -> PropertyList:
         """
         :return: Colored properties with at least one hotel on the set
         """
-        out: PropertyList = PropertyList([])
-        conflicts: PropertyList = self.class_a_properties()
-
-        for prop in self.client.properties:
-            if prop in conflicts:
-                continue
-            prop_attr: TileAttribute = prop.get_set_attribute()
-            for set_prop in self.client.properties:
-                if set_prop.get_set_attribute() == prop_attr and cast(ColoredProperty, set_prop).houses == 5:
-                    out.append(prop)
-        return out
+        return PropertyList(self.classify()[1])
 
     def class_c_properties(self) -> PropertyList:
         """
         :return: Colored properties with at least one house on each property
         """
-        out: PropertyList = PropertyList([])
-        conflicts: PropertyList = PropertyList(self.class_a_properties() + self.class_b_properties())
-
-        for prop in self.client.properties:
-            if prop in conflicts:
-                continue
-            flag: bool = True
-            for set_prop in self.client.properties:
-                if cast(ColoredProperty, set_prop).houses == 0:
-                    flag = False
-            if flag:
-                out.append(prop)
-        return out
+        return PropertyList(self.classify()[2])
 
     def class_d_properties(self) -> PropertyList:
         """
         :return:  Properties as part of a completed monopoly set
         """
-        conflicts: PropertyList = PropertyList(
-            self.class_a_properties() + self.class_b_properties() + self.class_c_properties())
-        return PropertyList(
-            [prop for prop in self.client.properties if prop not in conflicts and prop.is_monopoly_completed()])
+        return PropertyList(self.classify()[3])
 
     def class_e_properties(self) -> PropertyList:
         """
         :return: 50% or more completed sets
         """
-        conflicts: PropertyList = PropertyList(self.class_a_properties() + self.class_b_properties())
-        conflicts += self.class_c_properties() + self.class_d_properties()
-
-        return PropertyList([prop for prop in self.client.properties if
-                             prop not in conflicts and self.attribute_completion(prop.get_set_attribute()) >= 0.5])
+        return PropertyList(self.classify()[4])
 
     def class_f_properties(self) -> PropertyList:
         """
         :return: All inferior properties
         """
-        conflicts: PropertyList = PropertyList(
-            self.class_a_properties() + self.class_b_properties() + self.class_c_properties())
-        conflicts += self.class_d_properties() + self.class_e_properties()
-        return PropertyList([prop for prop in self.client.properties if prop not in conflicts])
+        return PropertyList(self.classify()[5])
 
 
 class TradeBroker:
@@ -769,60 +1425,96 @@ class TradeBroker:
         self.receiving: Union[Property, None] = None
         self.other_broker: Union["TradeBroker", None] = None
 
+    @staticmethod
+    def wanted_sets(player: Player) -> List[TileAttribute]:
+        """
+        :param player: The player to query
+        :return: The sets which the player owns part of, in the order the
+            player's properties were acquired (sets are wanted to complete them)
+        """
+        return [attr for attr in dict.fromkeys([prop.set_attribute for prop in player.properties])
+                if attr is not None]
+
+    def sorted_wanted_sets(self) -> List[TileAttribute]:
+        """
+        :return: The client's wanted sets, the most complete first
+        """
+        property_manager: PropertyManager = self.property_manager
+        return sorted(TradeBroker.wanted_sets(self.client),
+                      key=lambda attr: -property_manager.attribute_completion(attr))
+
     def compile_most_wanted_properties(self, attrs: List[TileAttribute]) -> PropertyList:
         out: PropertyList = PropertyList([])
         for attr in attrs:
             for player in self.client.game.players:
                 if player != self.client:
-                    for prop in player.properties:
-                        if attr in prop.attributes:
-                            out.append(prop)
+                    out += player.set_index.members.get(attr, [])
         return out
 
     def most_wanted_properties(self) -> PropertyList:
-        props: PropertyList = self.client.properties
-        attrs: List[TileAttribute] = []
+        return self.compile_most_wanted_properties(self.sorted_wanted_sets())
 
-        for prop in props:
-            set_attr: TileAttribute = prop.get_set_attribute()
-            if set_attr not in attrs:
-                attrs.append(set_attr)
+    def find_mutual_benefit(self, other_player: Player, wanted_prop: Property,
+                            other_sets: Union[List[TileAttribute], None] = None) -> bool:
+        """
+        Find a property of the client, in a set the other player wants,
+        to offer in exchange for a property of the other player
 
-        property_manager: PropertyManager = self.property_manager
-        for i in range(len(attrs) - 1):
-            for j in range(i + 1, len(attrs)):
-                if property_manager.attribute_completion(attrs[i]) < property_manager.attribute_completion(attrs[j]):
-                    tmp: TileAttribute = attrs[i]
-                    attrs[i] = attrs[j]
-                    attrs[j] = tmp
-
-        return self.compile_most_wanted_properties(attrs)
-
-    def find_mutual_benefit(self, other_player: Player, wanted_prop: Property) -> bool:
-        other_broker: TradeBroker = TradeBroker(other_player)
-        other_most_wanted: PropertyList = other_broker.most_wanted_properties()
-        for other_wanted_prop in other_most_wanted:
-            attr1: TileAttribute = wanted_prop.get_set_attribute()
-            attr2: TileAttribute = other_wanted_prop.get_set_attribute()
-            if other_wanted_prop in self.client.properties and attr1 != attr2:
-                self.other_broker = other_broker
+        :param other_player: The owner of the wanted property
+        :param wanted_prop: The property the client wants
+        :param other_sets: The other player's wanted sets (computed if not passed)
+        :return: True if a trade was found (and recorded on the broker)
+        """
+        client_sets: Dict[Union[TileAttribute, None], PropertyList] = self.client.set_index.members
+        for attr in other_sets if other_sets is not None else TradeBroker.wanted_sets(other_player):
+            if attr != wanted_prop.set_attribute and len(client_sets.get(attr, [])) > 0:
+                self.other_broker = TradeBroker(other_player)
                 self.receiving = wanted_prop
-                self.other_broker.receiving = other_wanted_prop
+                self.other_broker.receiving = client_sets[attr][0]
                 return True
         return False
 
     def match_broker(self) -> None:
-        most_wanted: PropertyList = self.most_wanted_properties()
-        for wanted_prop in most_wanted:
-            for other_player in self.client.game.players:
-                if other_player != self.client and wanted_prop in other_player.properties and self.find_mutual_benefit(
-                        other_player, wanted_prop):
-                    Logger.log("A trade is starting between {} and {}"
-                               .format(self.client.name, self.other_broker.client.name), type="trade")
+        """
+        Find every trade between the client and the other players in a single
+        pass over the set indexes: for each set the client wants, each owner
+        of properties in that set, and each property they own in it
+
+        :return: None
+        """
+        client: Player = self.client
+        for attr in self.sorted_wanted_sets():
+            for other_player in client.game.players:
+                wanted: Union[PropertyList, None] = other_player.set_index.members.get(attr)
+                if other_player == client or not wanted:
+                    continue
+                other_sets: List[TileAttribute] = TradeBroker.wanted_sets(other_player)
+                for wanted_prop in PropertyList(wanted):
+                    if self.find_mutual_benefit(other_player, wanted_prop, other_sets):
+                        client.game.logger.log("A trade is starting between {} and {}", client.name,
+                                               self.other_broker.client.name, type="trade")
+                        if self.trade_accepted():
+                            return
 
         self.other_broker = None
         self.receiving = None
 
+    def trade_accepted(self) -> bool:
+        """
+        :return: True if the matched trade should be executed: neither
+            side's strategy refuses it, and at least one accepts it (see
+            Strategy.on_trade_offer)
+        """
+        accepted: bool = False
+        for broker, other_broker in [(self, self.other_broker), (self.other_broker, self)]:
+            player: Player = broker.client
+            decision: Union[bool, None] = player.strategy.on_trade_offer(player.game, player, broker.receiving,
+                                                                          other_broker.receiving)
+            if decision is False:
+                return False
+            accepted = accepted or decision is True
+        return accepted
+
     def attempt_all_trades(self) -> None:
         self.match_broker()
         while self.other_broker is not None and self.receiving is not None:
@@ -832,9 +1524,8 @@ class TradeBroker:
     def execute_trade(self) -> None:
         self.receiving.transfer_ownership(self.client)
         self.other_broker.receiving.transfer_ownership(self.other_broker.client)
-        Logger.log(
-            "{} received {}\n{} received {}".format(self.client.name, self.receiving.name, self.other_broker.client,
-                                                    self.other_broker.receiving.name), type="trade")
+        self.client.game.logger.log("{} received {}\n{} received {}", self.client.name, self.receiving.name,
+                                    self.other_broker.client, self.other_broker.receiving.name, type="trade")
 
 
 def build_board() -> List[Tile]:
@@ -844,63 +1535,133 @@ def build_board() -> List[Tile]:
     """
     chance_label: str = "Chance"
     chest_label: str = "Community Chest"
-    return [BasicTile("Go", attribute=TileAttribute.GO),
-            ColoredProperty("Mediterranean Avenue", 60, [2, 10, 30, 90, 160, 250],
-                            TileAttribute.SET1),
-            BasicTile(chest_label, attribute=TileAttribute.CHEST),
-            ColoredProperty("Baltic Avenue", 60, [4, 20, 60, 180, 320, 450], TileAttribute.SET1),
-            BasicTile("Tax", attribute=TileAttribute.TAX),
-            NonColoredProperty("Reading Railroad", TileAttribute.RAILROAD),
-            ColoredProperty("Oriental Avenue", 100, [6, 30, 90, 270, 400, 550],
-                            TileAttribute.SET2),
-            BasicTile(chance_label, attribute=TileAttribute.CHANCE),
-            ColoredProperty("Vermont Avenue", 100, [6, 30, 90, 270, 400, 550], TileAttribute.SET2),
-            ColoredProperty("Connecticut Avenue", 120, [8, 40, 100, 300, 450, 600],
-                            TileAttribute.SET2),
-            BasicTile("Jail", attribute=TileAttribute.JAIL),
-            ColoredProperty("St. Charles Place", 140, [10, 50, 150, 450, 625, 750],
-                            TileAttribute.SET3),
-            NonColoredProperty("Electric Company", TileAttribute.UTILITY),
-            ColoredProperty("States Avenue", 140, [10, 50, 150, 450, 625, 750],
-                            TileAttribute.SET3),
-            ColoredProperty("Virginia Avenue", 160, [12, 60, 180, 500, 700, 900],
-                            TileAttribute.SET3),
-            NonColoredProperty("Pennsylvania Railroad", TileAttribute.RAILROAD),
-            ColoredProperty("St. James Place", 180, [14, 70, 200, 550, 750, 950],
-                            TileAttribute.SET4),
-            BasicTile(chest_label, attribute=TileAttribute.CHEST),
-            ColoredProperty("Tennessee Avenue", 180, [14, 70, 200, 550, 750, 950],
-                            TileAttribute.SET4),
-            ColoredProperty("New York Avenue", 200, [16, 80, 220, 600, 800, 1000],
-                            TileAttribute.SET4),
-            BasicTile("Free Parking", attribute=TileAttribute.FREE_PARKING),
-            ColoredProperty("Kentucky Avenue", 220, [18, 90, 250, 700, 875, 1050],
-                            TileAttribute.SET5),
-            BasicTile(chance_label, attribute=TileAttribute.CHANCE),
-            ColoredProperty("Indiana Avenue", 220, [18, 90, 250, 700, 875, 1050],
-                            TileAttribute.SET5),
-            ColoredProperty("Illinois Avenue", 240, [20, 100, 300, 750, 925, 1100],
-                            TileAttribute.SET5),
-            NonColoredProperty("B. & O. Railroad", TileAttribute.RAILROAD),
-            ColoredProperty("Atlantic Avenue", 260, [22, 110, 330, 800, 975, 1150],
-                            TileAttribute.SET6),
-            ColoredProperty("Ventnor Avenue", 260, [22, 110, 330, 800, 975, 1150],
-                            TileAttribute.SET6),
-            NonColoredProperty("Waterworks", TileAttribute.RAILROAD),
-            ColoredProperty("Marvin Gardens", 280, [24, 120, 360, 850, 1025, 1200],
-                            TileAttribute.SET6),
-            BasicTile("Go to Jail", attribute=TileAttribute.GO_TO_JAIL),
-            ColoredProperty("Pacific Avenue", 300, [26, 130, 390, 900, 1100, 1275],
-                            TileAttribute.SET7),
-            ColoredProperty("North Carolina Avenue", 300, [26, 130, 390, 900, 1100, 1275],
-                            TileAttribute.SET7),
-            BasicTile(chest_label, attribute=TileAttribute.CHEST),
-            ColoredProperty("Pennsylvania Avenue", 320, [28, 150, 450, 1000, 1200, 1400],
-                            TileAttribute.SET7),
-            NonColoredProperty("Short Line", TileAttribute.RAILROAD),
-            BasicTile(chance_label, attribute=TileAttribute.CHANCE),
-            ColoredProperty("Park Place", 350, [35, 175, 500, 1100, 1300, 1500],
-                            TileAttribute.SET8),
-            BasicTile("Tax", attribute=TileAttribute.TAX),
-            ColoredProperty("Boardwalk", 400, [50, 200, 600, 1400, 1700, 2000],
-                            TileAttribute.SET8)]
+    board: List[Tile] = [
+        BasicTile("Go", attribute=TileAttribute.GO),
+        ColoredProperty("Mediterranean Avenue", 60, (2, 10, 30, 90, 160, 250),
+                        TileAttribute.SET1),
+        BasicTile(chest_label, attribute=TileAttribute.CHEST),
+        ColoredProperty("Baltic Avenue", 60, (4, 20, 60, 180, 320, 450), TileAttribute.SET1),
+        BasicTile("Tax", attribute=TileAttribute.TAX),
+        NonColoredProperty("Reading Railroad", TileAttribute.RAILROAD),
+        ColoredProperty("Oriental Avenue", 100, (6, 30, 90, 270, 400, 550),
+                        TileAttribute.SET2),
+        BasicTile(chance_label, attribute=TileAttribute.CHANCE),
+        ColoredProperty("Vermont Avenue", 100, (6, 30, 90, 270, 400, 550), TileAttribute.SET2),
+        ColoredProperty("Connecticut Avenue", 120, (8, 40, 100, 300, 450, 600),
+                        TileAttribute.SET2),
+        BasicTile("Jail", attribute=TileAttribute.JAIL),
+        ColoredProperty("St. Charles Place", 140, (10, 50, 150, 450, 625, 750),
+                        TileAttribute.SET3),
+        NonColoredProperty("Electric Company", TileAttribute.UTILITY),
+        ColoredProperty("States Avenue", 140, (10, 50, 150, 450, 625, 750),
+                        TileAttribute.SET3),
+        ColoredProperty("Virginia Avenue", 160, (12, 60, 180, 500, 700, 900),
+                        TileAttribute.SET3),
+        NonColoredProperty("Pennsylvania Railroad", TileAttribute.RAILROAD),
+        ColoredProperty("St. James Place", 180, (14, 70, 200, 550, 750, 950),
+                        TileAttribute.SET4),
+        BasicTile(chest_label, attribute=TileAttribute.CHEST),
+        ColoredProperty("Tennessee Avenue", 180, (14, 70, 200, 550, 750, 950),
+                        TileAttribute.SET4),
+        ColoredProperty("New York Avenue", 200, (16, 80, 220, 600, 800, 1000),
+                        TileAttribute.SET4),
+        BasicTile("Free Parking", attribute=TileAttribute.FREE_PARKING),
+        ColoredProperty("Kentucky Avenue", 220, (18, 90, 250, 700, 875, 1050),
+                        TileAttribute.SET5),
+        BasicTile(chance_label, attribute=TileAttribute.CHANCE),
+        ColoredProperty("Indiana Avenue", 220, (18, 90, 250, 700, 875, 1050),
+                        TileAttribute.SET5),
+        ColoredProperty("Illinois Avenue", 240, (20, 100, 300, 750, 925, 1100),
+                        TileAttribute.SET5),
+        NonColoredProperty("B. & O. Railroad", TileAttribute.RAILROAD),
+        ColoredProperty("Atlantic Avenue", 260, (22, 110, 330, 800, 975, 1150),
+                        TileAttribute.SET6),
+        ColoredProperty("Ventnor Avenue", 260, (22, 110, 330, 800, 975, 1150),
+                        TileAttribute.SET6),
+        NonColoredProperty("Waterworks", TileAttribute.UTILITY),
+        ColoredProperty("Marvin Gardens", 280, (24, 120, 360, 850, 1025, 1200),
+                        TileAttribute.SET6),
+        BasicTile("Go to Jail", attribute=TileAttribute.GO_TO_JAIL),
+        ColoredProperty("Pacific Avenue", 300, (26, 130, 390, 900, 1100, 1275),
+                        TileAttribute.SET7),
+        ColoredProperty("North Carolina Avenue", 300, (26, 130, 390, 900, 1100, 1275),
+                        TileAttribute.SET7),
+        BasicTile(chest_label, attribute=TileAttribute.CHEST),
+        ColoredProperty("Pennsylvania Avenue", 320, (28, 150, 450, 1000, 1200, 1400),
+                        TileAttribute.SET7),
+        NonColoredProperty("Short Line", TileAttribute.RAILROAD),
+        BasicTile(chance_label, attribute=TileAttribute.CHANCE),
+        ColoredProperty("Park Place", 350, (35, 175, 500, 1100, 1300, 1500),
+                        TileAttribute.SET8),
+        BasicTile("Tax", attribute=TileAttribute.TAX),
+        ColoredProperty("Boardwalk", 400, (50, 200, 600, 1400, 1700, 2000),
+                        TileAttribute.SET8)]
+
+    for index, tile in enumerate(board):
+        tile.index = index
+    return board
+
+
+class BoardTables:
+    def __init__(self, board: List[Tile]):
+        """
+        Static facts about a board, derived once and shared by every game
+        (tiles themselves are rebuilt per game since they hold ownership state).
+        Every table is a tuple (by board index or set id) or a read-only mapping.
+
+        :param board: A freshly built board
+        """
+        self.size: int = len(board)
+        self.names: Tuple[str, ...] = tuple([tile.name for tile in board])
+        self.attributes: Tuple[FrozenSet[TileAttribute], ...] = tuple([frozenset(tile.attributes) for tile in board])
+        self.prices: Tuple[int, ...] = tuple([tile.price if isinstance(tile, Property) else 0 for tile in board])
+        self.rents: Tuple[Tuple[int, ...], ...] = tuple(
+            [tile.rents if isinstance(tile, ColoredProperty) else () for tile in board])
+        self.house_costs: Tuple[int, ...] = tuple(
+            [HOUSE_COSTS[tile.set_attribute] if isinstance(tile, ColoredProperty) else 0 for tile in board])
+        self.purchasable: Tuple[bool, ...] = tuple([TileAttribute.PROPERTY in attrs for attrs in self.attributes])
+        self.property_tiles: Tuple[int, ...] = tuple([index for index in range(self.size) if self.purchasable[index]])
+        self.go_to_jail: Tuple[bool, ...] = tuple([TileAttribute.GO_TO_JAIL in attrs for attrs in self.attributes])
+
+        # The set TileAttribute of each tile (None for tiles which are not part of a set)
+        self.tile_sets: Tuple[Union[TileAttribute, None], ...] = tuple(
+            [tile.set_attribute if isinstance(tile, Property) else None for tile in board])
+        # Sets are numbered in the order they first appear on the board
+        self.set_attributes: Tuple[TileAttribute, ...] = tuple(
+            dict.fromkeys([attr for attr in self.tile_sets if attr is not None]))
+        self.set_ids: Mapping[TileAttribute, int] = MappingProxyType(
+            {attr: set_id for set_id, attr in enumerate(self.set_attributes)})
+        self.set_of: Tuple[int, ...] = tuple([self.set_ids[attr] if attr is not None else -1
+                                              for attr in self.tile_sets])  # -1 = not part of a set
+        self.set_id_members: Tuple[Tuple[int, ...], ...] = tuple(
+            [tuple([index for index in range(self.size) if self.set_of[index] == set_id])
+             for set_id in range(len(self.set_attributes))])
+        self.set_id_sizes: Tuple[int, ...] = tuple([len(members) for members in self.set_id_members])
+        self.set_members: Mapping[TileAttribute, Tuple[int, ...]] = MappingProxyType(
+            dict(zip(self.set_attributes, self.set_id_members)))
+
+        # Railroads and utilities are not tagged with their set, so they are counted by type
+        sizes: Dict[TileAttribute, int] = dict(zip(self.set_attributes, self.set_id_sizes))
+        attribute_counts: Dict[TileAttribute, int] = {}
+        for tile in board:
+            if isinstance(tile, NonColoredProperty):
+                sizes[tile.prop_type] = sizes.get(tile.prop_type, 0) + 1
+            for attr in tile.attributes:
+                attribute_counts[attr] = attribute_counts.get(attr, 0) + 1
+        self.set_sizes: Mapping[TileAttribute, int] = MappingProxyType(sizes)
+        self.attribute_counts: Mapping[TileAttribute, int] = MappingProxyType(attribute_counts)
+
+
+BOARD_TABLES: BoardTables = BoardTables(build_board())
+
+
+def spawn_seeds(seed: int, count: int) -> List[int]:
+    """
+    Derive independent seeds for child games (e.g. for batch workers)
+
+    :param seed: The parent seed
+    :param count: The number of seeds to derive
+    :return: A 64-bit seed per child, the same for every call with the same parent seed
+    """
+    seeder: random.Random = random.Random(seed)
+    return [seeder.getrandbits(64) for _ in range(count)]
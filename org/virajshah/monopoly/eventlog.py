@@ -0,0 +1,275 @@
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, IO, Iterator, List, Tuple
+
+from org.virajshah.monopoly.records import TurnHistoryRecord
+
+MAGIC: bytes = b"MSPYCOL2"
+SCHEMA_HEADER: struct.Struct = struct.Struct("<I")  # Length of the schema ("name:typecode,...")
+CHUNK_HEADER: struct.Struct = struct.Struct("<4sI")  # b"CHNK", number of rows
+CHUNK_MAGIC: bytes = b"CHNK"
+
+# (name, array typecode) of every column of each kind of file
+TURN_COLUMNS: List[Tuple[str, str]] = [
+    ("game", "q"),
+    ("turn", "i"),
+    ("player", "B"),
+    ("dice_roll1", "B"),
+    ("dice_roll2", "B"),
+    ("origin", "B"),
+    ("destination", "B"),
+    ("origin_in_jail", "B"),
+    ("destination_in_jail", "B"),
+    ("initial_balance", "i"),
+    ("final_balance", "i")
+]
+GAME_COLUMNS: List[Tuple[str, str]] = [
+    ("game", "q"),
+    ("seed", "Q"),
+    ("turns", "i"),
+    ("players", "B"),
+    ("winner", "b")  # Seat of the winner (-1 if the game was unfinished)
+]
+PLAYER_COLUMNS: List[Tuple[str, str]] = [
+    ("game", "q"),
+    ("player", "B"),
+    ("mortgage_to_build", "B"),
+    ("quick_builder", "B"),
+    ("insurance_rate", "d"),
+    ("won", "B"),
+    ("bankrupt", "B"),
+    ("final_balance", "i")
+]
+INVESTMENT_COLUMNS: List[Tuple[str, str]] = [
+    ("game", "q"),
+    ("property", "B"),  # Board index of the property
+    ("owner", "B"),
+    ("purchased_turn", "i"),
+    ("purchased_price", "i"),
+    ("active", "B"),
+    ("transactions", "i"),
+    ("rent_collected", "q")
+]
+
+
+def padding(size: int) -> int:
+    """
+    :param size: The size of a block in bytes
+    :return: The number of bytes needed to pad the block to a multiple of 8
+    """
+    return -size % 8
+
+
+class ColumnWriter:
+    def __init__(self, filename: str, columns: List[Tuple[str, str]], **kwargs):
+        """
+        Write rows to a columnar binary file. Rows are buffered in one array
+        per column and written as a chunk (every column's values,
+        little-endian, one column after another, each padded to 8 bytes)
+        once the buffer is full. The file starts with its schema, so it can
+        be read without knowing which columns it has.
+
+        :param filename: The file to write to (it is overwritten)
+        :param columns: The (name, array typecode) of every column
+        :param kwargs:
+            chunk_rows=int: The number of rows per chunk (default 65536)
+        """
+        self.filename: str = filename
+        self.chunk_rows: int = kwargs["chunk_rows"] if "chunk_rows" in kwargs else 65536
+        self.column_types: List[Tuple[str, str]] = columns
+        self.columns: List[array] = [array(typecode) for _, typecode in columns]
+        self.buffered: int = 0
+        self.rows: int = 0  # Rows written, including buffered rows
+
+        schema: bytes = ",".join(["{}:{}".format(name, typecode) for name, typecode in columns]).encode("ascii")
+        self.fp: IO = open(filename, "wb")
+        self.fp.write(MAGIC + SCHEMA_HEADER.pack(len(schema)) + schema)
+        self.fp.write(bytes(padding(len(MAGIC) + SCHEMA_HEADER.size + len(schema))))
+
+    def append(self, *values) -> None:
+        """
+        Buffer a single row
+
+        :param values: The value of every column, in column order
+        :return: None
+        """
+        for column, value in zip(self.columns, values):
+            column.append(value)
+        self.buffered += 1
+        self.rows += 1
+
+        if self.buffered >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the buffered rows as a chunk
+
+        :return: None
+        """
+        if self.buffered == 0:
+            return
+
+        self.fp.write(CHUNK_HEADER.pack(CHUNK_MAGIC, self.buffered))
+        for column in self.columns:
+            if sys.byteorder == "big":
+                column.byteswap()
+            column.tofile(self.fp)
+            self.fp.write(bytes(padding(len(column) * column.itemsize)))
+            del column[:]
+        self.buffered = 0
+        self.fp.flush()
+
+    def close(self) -> None:
+        """
+        Write any buffered rows and close the file
+
+        :return: None
+        """
+        self.flush()
+        self.fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class TurnRecorder(ColumnWriter):
+    def __init__(self, filename: str, **kwargs):
+        """
+        Record turn events (see TURN_COLUMNS) to a columnar binary file
+
+        :param filename: The file to write to (it is overwritten)
+        :param kwargs:
+            chunk_rows=int: The number of rows per chunk (default 65536)
+        """
+        super().__init__(filename, TURN_COLUMNS, **kwargs)
+
+    def record(self, game_id: int, turn_number: int, player: int, turn: TurnHistoryRecord, position: int,
+               balance: int) -> None:
+        """
+        Buffer a single turn
+
+        :param game_id: The identifier of the game
+        :param turn_number: The turn number (in the game)
+        :param player: The seat of the player whose turn it was
+        :param turn: The turn's history record
+        :param position: The player's position at the end of the turn
+        :param balance: The player's balance at the end of the turn
+        :return: None
+        """
+        self.append(game_id, turn_number, player, turn.dice_roll1, turn.dice_roll2, turn.origin, position,
+                    turn.origin_in_jail, turn.destination_in_jail, turn.initial_balance, balance)
+
+
+class ColumnReader:
+    def __init__(self, filename: str):
+        """
+        Open a file written by a ColumnWriter. The file is memory-mapped,
+        so columns are only read from disk when they are accessed.
+
+        :param filename: The file to read
+        """
+        self.filename: str = filename
+        self.fp: IO = open(filename, "rb")
+        self.map: mmap.mmap = mmap.mmap(self.fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self.chunks: List[Tuple[int, int]] = []  # (offset of the first column, rows) of every chunk
+        self.rows: int = 0
+
+        if self.map[:len(MAGIC)] != MAGIC:
+            raise ValueError("{} is not a columnar result file".format(filename))
+
+        offset: int = len(MAGIC)
+        schema_size: int = SCHEMA_HEADER.unpack_from(self.map, offset)[0]
+        offset += SCHEMA_HEADER.size
+        schema: str = self.map[offset:offset + schema_size].decode("ascii")
+        self.column_types: List[Tuple[str, str]] = [(column.split(":")[0], column.split(":")[1])
+                                                    for column in schema.split(",")]
+        self.column_names: List[str] = [name for name, _ in self.column_types]
+        offset += schema_size + padding(offset + schema_size)
+
+        while offset < len(self.map):
+            magic, rows = CHUNK_HEADER.unpack_from(self.map, offset)
+            if magic != CHUNK_MAGIC:
+                raise ValueError("Corrupt chunk at byte {} of {}".format(offset, filename))
+            offset += CHUNK_HEADER.size
+            self.chunks.append((offset, rows))
+            self.rows += rows
+            for _, typecode in self.column_types:
+                size: int = rows * array(typecode).itemsize
+                offset += size + padding(size)
+
+    def chunk_columns(self, chunk: int) -> Dict[str, memoryview]:
+        """
+        :param chunk: The index of the chunk
+        :return: A view (into the mapped file) of every column in the chunk.
+            Values are little-endian.
+        """
+        offset, rows = self.chunks[chunk]
+        view: memoryview = memoryview(self.map)
+        columns: Dict[str, memoryview] = {}
+        for name, typecode in self.column_types:
+            size: int = rows * array(typecode).itemsize
+            columns[name] = view[offset:offset + size].cast(typecode)
+            offset += size + padding(size)
+        return columns
+
+    def column(self, name: str) -> array:
+        """
+        :param name: The name of the column
+        :return: Every value of the column, across all chunks
+        """
+        out: array = array(dict(self.column_types)[name])
+        for chunk in range(len(self.chunks)):
+            view: memoryview = self.chunk_columns(chunk)[name]
+            out.frombytes(view.cast("B"))
+            view.release()
+        if sys.byteorder == "big":
+            out.byteswap()
+        return out
+
+    def __iter__(self) -> Iterator[Dict[str, int]]:
+        """
+        :return: An iterator over every row, as a dictionary of column values
+        """
+        for chunk in range(len(self.chunks)):
+            columns: Dict[str, memoryview] = self.chunk_columns(chunk)
+            for row in range(self.chunks[chunk][1]):
+                yield {name: columns[name][row] for name in self.column_names}
+
+    def __len__(self):
+        """
+        :return: The number of rows in the file
+        """
+        return self.rows
+
+    def close(self) -> None:
+        """
+        Unmap and close the file
+
+        :return: None
+        """
+        self.map.close()
+        self.fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class TurnLog(ColumnReader):
+    def __init__(self, filename: str):
+        """
+        Open a file written by TurnRecorder
+
+        :param filename: The file to read
+        """
+        super().__init__(filename)
+        if self.column_types != TURN_COLUMNS:
+            raise ValueError("{} is not a turn log".format(filename))
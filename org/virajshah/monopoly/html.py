@@ -1,4 +1,17 @@
-from typing import Dict, List, Union
+from functools import lru_cache
+from typing import Dict, IO, Iterable, Iterator, List, Union
+
+
+@lru_cache(maxsize=4096)
+def escape_attribute(value: str) -> str:
+    """
+    Escape an attribute value for use inside double quotes. Documents
+    repeat the same few values (ids aside) many times, so results are cached.
+
+    :param value: The attribute value
+    :return: The value with &, <, > and " escaped
+    """
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
 
 
 class DOMElement:
@@ -12,11 +25,15 @@ class DOMElement:
             autoclose=True: for <elem/>
             classname=str: for <elem class=str>
             children=List[Union[DOMElement, str]] for children
+            children=Iterable[Union[DOMElement, str]]: a generator of children,
+                which is consumed (once) while the element is streamed
         """
         self.element = element
         self.attributes: Dict[str, str] = {}
-        self.children: List[Union[DOMElement, str]] = []
+        self.children: Union[List[Union[DOMElement, str]], Iterable[Union[DOMElement, str]]] = []
         self.autoclose: bool = False
+        self.close_tag: str = "</" + element + ">"
+        self._open_tag: Union[str, None] = None  # Built on first render, reset by set_attribute and append_child
 
         for key in kwargs:
             if key not in ["children", "autoclose", "classname"]:
@@ -29,6 +46,18 @@ class DOMElement:
         if "classname" in kwargs:
             self.attributes["class"] = kwargs["classname"]
 
+    def set_attribute(self, name: str, value: str) -> None:
+        """
+        Set an attribute on the element.
+        Equivalent to HTMLObject.setAttribute(name, value)
+
+        :param name: The name of the attribute
+        :param value: The value of the attribute
+        :return: None
+        """
+        self.attributes[name] = value
+        self._open_tag = None
+
     def append_child(self, child: Union["DOMElement", str]) -> None:
         """
         Add a child to a DOMElement.
@@ -40,20 +69,71 @@ class DOMElement:
         self.children.append(child)
         if self.autoclose:
             self.autoclose = False
+            self._open_tag = None
+
+    def open_tag(self) -> str:
+        """
+        :return: The opening tag of the element, including its attributes
+        """
+        if self._open_tag is None:
+            parts: List[str] = ["<", self.element]
+            for attr in self.attributes:
+                parts += [" ", attr, '="', escape_attribute(str(self.attributes[attr])), '"']
+            parts.append("/>" if self.autoclose else ">")
+            self._open_tag = "".join(parts)
+        return self._open_tag
+
+    def render(self, parts: List[str]) -> None:
+        """
+        Append the HTML representation of the DOM to a list of fragments
+
+        :param parts: The list to append to
+        :return: None
+        """
+        parts.append(self.open_tag())
+        for child in self.children:
+            if isinstance(child, DOMElement):
+                child.render(parts)
+            else:
+                parts.append(str(child))
+        parts.append(self.close_tag)
+
+    def stream(self) -> Iterator[str]:
+        """
+        Generate the HTML representation of the DOM in chunks, so that
+        large documents can be written without building them in memory
+
+        :return: An iterator over consecutive pieces of the HTML
+        """
+        yield self.open_tag()
+        for child in self.children:
+            if isinstance(child, DOMElement):
+                yield from child.stream()
+            else:
+                yield str(child)
+        yield self.close_tag
+
+    def render_to(self, fp: IO, chunk_size: int = 4096) -> None:
+        """
+        Write the HTML representation of the DOM to a file, joining
+        fragments into chunks instead of writing each one separately
+
+        :param fp: The file to write to
+        :param chunk_size: The number of fragments to join per write
+        :return: None
+        """
+        parts: List[str] = []
+        for part in self.stream():
+            parts.append(part)
+            if len(parts) >= chunk_size:
+                fp.write("".join(parts))
+                parts.clear()
+        fp.write("".join(parts))
 
     def __str__(self):
         """
         :return: The HTML representation of the DOM (recursively includes all children)
         """
-        buffer: str = "<" + self.element
-        for attr in self.attributes:
-            buffer += ' {}="{}"'.format(attr, self.attributes[attr])
-        if self.autoclose:
-            buffer += "/>"
-        else:
-            buffer += ">"
-        if len(self.children) > 0:
-            for child in self.children:
-                buffer += str(child)
-        buffer += "</{}>".format(self.element)
-        return buffer
+        parts: List[str] = []
+        self.render(parts)
+        return "".join(parts)
@@ -0,0 +1,435 @@
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from org.virajshah.monopoly.compact import CompactGame
+from org.virajshah.monopoly.core import BOARD_TABLES, JAIL_INDEX, spawn_seeds
+
+# Ownership state is only kept for the properties ("slots"), ordered so that every set is contiguous
+SLOT_TILES: np.ndarray = np.array(sorted(BOARD_TABLES.property_tiles,
+                                         key=lambda tile: (BOARD_TABLES.set_of[tile], tile)), dtype=np.int64)
+SLOTS: int = len(SLOT_TILES)
+TILE_SLOT: np.ndarray = np.full(BOARD_TABLES.size, -1, dtype=np.int64)
+TILE_SLOT[SLOT_TILES] = np.arange(SLOTS)
+
+PRICE: np.ndarray = np.array([BOARD_TABLES.prices[tile] for tile in SLOT_TILES], dtype=np.int64)
+HOUSE_COST: np.ndarray = np.array([BOARD_TABLES.house_costs[tile] for tile in SLOT_TILES], dtype=np.int64)
+RENT: np.ndarray = np.array([BOARD_TABLES.rents[tile] for tile in SLOT_TILES], dtype=np.int64)
+SLOT_SET: np.ndarray = np.array([BOARD_TABLES.set_of[tile] for tile in SLOT_TILES], dtype=np.int64)
+SET_START: np.ndarray = np.searchsorted(SLOT_SET, np.arange(len(BOARD_TABLES.set_id_sizes)))
+SET_SIZE: np.ndarray = np.diff(np.append(SET_START, SLOTS))
+SLOT_SET_SIZE: np.ndarray = SET_SIZE[SLOT_SET]
+SET_MEMBERS: np.ndarray = np.array([list(range(start, start + size)) + [-1] * (SET_SIZE.max() - size)
+                                    for start, size in zip(SET_START, SET_SIZE)], dtype=np.int64)
+IS_GO_TO_JAIL: np.ndarray = np.array(BOARD_TABLES.go_to_jail, dtype=bool)
+
+UNORDERED: int = np.iinfo(np.int64).max  # Sort key for slots which are not part of a selection
+
+CLASS_A: int = 0
+CLASS_B: int = 1
+CLASS_C: int = 2
+CLASS_D: int = 3
+CLASS_E: int = 4
+CLASS_F: int = 5
+
+
+class LockstepGames:
+    def __init__(self, games: int, players: int = 4, **kwargs):
+        """
+        Initialize a batch of games which are advanced together, one turn
+        per step, using NumPy arrays of shape (games, players) and
+        (games, properties). The rules are those of MonopolyGame (as
+        mirrored by CompactGame), but random numbers come from a NumPy
+        Generator, so individual games differ from the object engine while
+        their statistics do not.
+
+        :param games: The number of games to play
+        :param players: The number of players in each game
+        :param kwargs:
+            seed=int: The seed for the random number generator
+            rng=numpy.random.Generator: The random number generator (overrides seed)
+        """
+        self.rng: np.random.Generator = kwargs["rng"] if "rng" in kwargs else np.random.default_rng(
+            kwargs["seed"] if "seed" in kwargs else None)
+        self.games: int = games
+        self.player_count: int = players
+
+        self.balances: np.ndarray = np.full((games, players), 1500, dtype=np.int64)
+        self.positions: np.ndarray = np.zeros((games, players), dtype=np.int64)
+        self.active: np.ndarray = np.ones((games, players), dtype=bool)
+        self.mortgage_to_build: np.ndarray = self.rng.integers(0, 2, (games, players)).astype(bool)
+        self.quick_builder: np.ndarray = self.rng.integers(0, 2, (games, players)).astype(bool)
+        self.insurance_rate: np.ndarray = self.rng.random((games, players)) / 4
+
+        # Indexed by property slot (see SLOT_TILES)
+        self.owners: np.ndarray = np.full((games, SLOTS), -1, dtype=np.int64)
+        self.houses: np.ndarray = np.zeros((games, SLOTS), dtype=np.int64)
+        self.mortgaged: np.ndarray = np.zeros((games, SLOTS), dtype=bool)
+        self.acquired: np.ndarray = np.zeros((games, SLOTS), dtype=np.int64)
+        self.acquisitions: np.ndarray = np.zeros(games, dtype=np.int64)
+
+        self.curr_player: np.ndarray = np.full(games, -1, dtype=np.int64)
+        self.turns: np.ndarray = np.zeros(games, dtype=np.int64)
+
+    def insurance_amount(self, games: np.ndarray, players: np.ndarray) -> np.ndarray:
+        """
+        :param games: The games to query
+        :param players: The player (per game) to query
+        :return: The amount of money each player keeps as insurance
+        """
+        circulation: np.ndarray = (self.balances[games] * self.active[games]).sum(axis=1)
+        return np.trunc(self.insurance_rate[games, players] * circulation).astype(np.int64)
+
+    def run(self, max_turns: int = 10000) -> None:
+        """
+        Advance every game until it is won or reaches the turn limit
+
+        :param max_turns: The number of turns after which a game is abandoned
+        :return: None
+        """
+        while self.step(max_turns):
+            pass
+
+    def step(self, max_turns: int = 10000, dice: Union[np.ndarray, None] = None) -> bool:
+        """
+        Run the next turn of every unfinished game
+
+        :param max_turns: The number of turns after which a game is abandoned
+        :param dice: The sum of the two dice rolled in each game (default: rolled
+            with the generator). Entries for finished games are ignored.
+        :return: False if every game has finished
+        """
+        remaining: np.ndarray = self.active.sum(axis=1)
+        games: np.ndarray = np.nonzero((remaining > 1) & (self.turns < max_turns))[0]
+        if len(games) == 0:
+            return False
+
+        # The current player is an index into each game's list of active players
+        curr: np.ndarray = self.curr_player[games] + 1
+        curr[curr >= remaining[games]] = 0
+        self.curr_player[games] = curr
+        active: np.ndarray = self.active[games]
+        players: np.ndarray = np.argmax(active & (np.cumsum(active, axis=1) - 1 == curr[:, None]), axis=1)
+        self.turns[games] += 1
+
+        rolls: np.ndarray = self.rng.integers(1, 7, (len(games), 2)).sum(axis=1) if dice is None else dice[games]
+        positions: np.ndarray = (self.positions[games, players] + rolls) % BOARD_TABLES.size
+
+        # Landing on GO_TO_JAIL ends the turn
+        jailed: np.ndarray = IS_GO_TO_JAIL[positions]
+        self.positions[games, players] = np.where(jailed, JAIL_INDEX, positions)
+        games, players, slots = games[~jailed], players[~jailed], TILE_SLOT[positions[~jailed]]
+
+        landed: np.ndarray = slots != -1
+        self.player_landed_on_property(games[landed], players[landed], slots[landed])
+
+        # Only players who own something have anything to build or mortgage
+        owners: np.ndarray = (self.owners[games] == players[:, None]).any(axis=1)
+        self.build_houses(games[owners], players[owners])
+
+        broke: np.ndarray = self.balances[games, players] < 0
+        self.force_mortgage(games[broke], players[broke], -self.balances[games[broke], players[broke]])
+
+        broke = self.balances[games, players] < 0
+        self.bankrupt(games[broke], players[broke])
+        return True
+
+    def player_landed_on_property(self, games: np.ndarray, players: np.ndarray, slots: np.ndarray) -> None:
+        """
+        Purchase the property or pay rent on it, in every game at once
+
+        :param games: The games in which a player landed on a property
+        :param players: The player who landed, per game
+        :param slots: The property landed on, per game
+        :return: None
+        """
+        owners: np.ndarray = self.owners[games, slots]
+
+        buy: np.ndarray = (owners == -1) & (
+                self.balances[games, players] - PRICE[slots] >= self.insurance_amount(games, players))
+        buyers: np.ndarray = games[buy]
+        self.owners[buyers, slots[buy]] = players[buy]
+        self.acquired[buyers, slots[buy]] = self.acquisitions[buyers]
+        self.acquisitions[buyers] += 1
+        self.balances[buyers, players[buy]] -= PRICE[slots[buy]]
+
+        pay: np.ndarray = (owners != -1) & (owners != players)
+        payers: np.ndarray = games[pay]
+        rent_due: np.ndarray = RENT[slots[pay], self.houses[payers, slots[pay]]]
+        self.balances[payers, players[pay]] -= rent_due
+        self.balances[payers, owners[pay]] += rent_due
+
+    def classify(self, games: np.ndarray, players: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sort each player's properties into classes A through F
+        (see PropertyManager.classify)
+
+        :param games: The games to classify
+        :param players: The player (per game) whose properties are classified
+        :return: The class of every slot (-1 if not owned by the player) and
+            the number of hotels in every slot's set
+        """
+        houses: np.ndarray = self.houses[games]
+        mine: np.ndarray = self.owners[games] == players[:, None]
+        hotels: np.ndarray = mine & (houses == 5)
+
+        monopoly: np.ndarray = np.add.reduceat(mine, SET_START, axis=1)[:, SLOT_SET] == SLOT_SET_SIZE
+        hotels_in_set: np.ndarray = np.add.reduceat(hotels, SET_START, axis=1)[:, SLOT_SET]
+        all_hotels: np.ndarray = (hotels.sum(axis=1) == mine.sum(axis=1))[:, None]
+        all_improved: np.ndarray = ~(mine & (houses == 0)).any(axis=1)[:, None]
+
+        # PropertyManager.attribute_completion() never reaches 0.5, so class E stays empty
+        classes: np.ndarray = np.where(monopoly, CLASS_D, CLASS_F)
+        classes = np.where(all_improved, CLASS_C, classes)
+        classes = np.where(hotels_in_set > 0, CLASS_B, classes)
+        classes = np.where(all_hotels & monopoly, CLASS_A, classes)
+        return np.where(mine, classes, -1), hotels_in_set
+
+    def build_houses(self, games: np.ndarray, players: np.ndarray) -> None:
+        """
+        Mortgage and build houses according to each player's configuration
+        (see MonopolyGame.build_houses)
+
+        :param games: The games in which to build
+        :param players: The player (per game) who is building
+        :return: None
+        """
+        classes, hotels_in_set = self.classify(games, players)
+
+        # Players who mortgage to build liquidate class E and F (E is always empty)
+        liquidating: np.ndarray = self.mortgage_to_build[games, players][:, None] & (classes == CLASS_F) & \
+            ~self.mortgaged[games]
+        some: np.ndarray = liquidating.any(axis=1)
+        self.sell_and_mortgage(games[some], players[some], liquidating[some])
+
+        # Quick builders build on classes B + C + D, others on the first non-empty one
+        buildable: np.ndarray = (classes >= CLASS_B) & (classes <= CLASS_D)
+        some = buildable.any(axis=1)
+        games, players, classes, hotels_in_set, buildable = \
+            games[some], players[some], classes[some], hotels_in_set[some], buildable[some]
+        if len(games) == 0:
+            return
+
+        first_class: np.ndarray = np.where(buildable, classes, CLASS_F).min(axis=1)[:, None]
+        selected: np.ndarray = buildable & (self.quick_builder[games, players][:, None] | (classes == first_class))
+        order: np.ndarray = np.argsort(np.where(selected, (classes << 32) + self.acquired[games], UNORDERED), axis=1)
+        # Class B lists a property once per hotel in its set
+        repeats: np.ndarray = np.where(classes == CLASS_B, hotels_in_set, 1)
+        counts: np.ndarray = selected.sum(axis=1)
+
+        for rank in range(counts.max()):
+            ranked: np.ndarray = rank < counts
+            slots: np.ndarray = order[ranked, rank]
+            slot_repeats: np.ndarray = repeats[ranked, slots]
+            for repeat in range(slot_repeats.max()):
+                building: np.ndarray = repeat < slot_repeats
+                self.build_on(games[ranked][building], players[ranked][building], slots[building])
+
+    def build_on(self, games: np.ndarray, players: np.ndarray, slots: np.ndarray) -> None:
+        """
+        Build as many houses as each player can afford on a property, then
+        even out the houses on its set
+
+        :param games: The games in which to build
+        :param players: The player (per game) who is building
+        :param slots: The property (per game) to build on
+        :return: None
+        """
+        cost: np.ndarray = HOUSE_COST[slots]
+        affordable: np.ndarray = (self.balances[games, players] - self.insurance_amount(games, players) - 1) // cost
+        built: np.ndarray = np.clip(affordable, 0, 5 - self.houses[games, slots])
+        self.houses[games, slots] += built
+        self.balances[games, players] -= built * cost
+        self.distribute_houses(games, players, slots)
+
+    def distribute_houses(self, games: np.ndarray, players: np.ndarray, slots: np.ndarray) -> None:
+        """
+        Even out the houses on the set which each property belongs to
+        (see ColoredProperty.distribute_houses)
+
+        :param games: The games in which to distribute houses
+        :param players: The owner (per game)
+        :param slots: A property (per game) in the set
+        :return: None
+        """
+        members: np.ndarray = SET_MEMBERS[SLOT_SET[slots]]
+        valid: np.ndarray = members != -1
+        members = np.where(valid, members, 0)
+        owned: np.ndarray = valid & (self.owners[games[:, None], members] == players[:, None])
+
+        # Ties go to the property acquired first
+        order: np.ndarray = np.argsort(np.where(owned, self.acquired[games[:, None], members], UNORDERED), axis=1)
+        members = np.take_along_axis(members, order, axis=1)
+        owned = np.take_along_axis(owned, order, axis=1)
+        rows: np.ndarray = np.arange(len(games))
+
+        while True:
+            houses: np.ndarray = self.houses[games[:, None], members]
+            fewest: np.ndarray = np.argmin(np.where(owned, houses, 6), axis=1)
+            most: np.ndarray = np.argmax(np.where(owned, houses, -1), axis=1)
+            uneven: np.ndarray = houses[rows, most] - houses[rows, fewest] > 1
+            if not uneven.any():
+                return
+            self.houses[games[uneven], members[uneven, fewest[uneven]]] += 1
+            self.houses[games[uneven], members[uneven, most[uneven]]] -= 1
+
+    def sell_and_mortgage(self, games: np.ndarray, players: np.ndarray, slots: np.ndarray) -> None:
+        """
+        Sell all houses on, and mortgage, a selection of each player's properties
+
+        :param games: The games in which to mortgage
+        :param players: The owner (per game)
+        :param slots: A (games, slots) mask of the properties to mortgage
+        :return: None
+        """
+        houses: np.ndarray = self.houses[games]
+        self.balances[games, players] += (slots * (houses * HOUSE_COST // 2 + PRICE // 2)).sum(axis=1)
+        self.houses[games] = np.where(slots, 0, houses)
+        self.mortgaged[games] |= slots
+
+    def liquidate(self, games: np.ndarray, players: np.ndarray, slots: np.ndarray, thresholds: np.ndarray) \
+            -> np.ndarray:
+        """
+        Mortgage a selection of each player's properties, in the order they
+        were acquired, until a threshold has been liquidated
+
+        :param games: The games in which to mortgage
+        :param players: The owner (per game)
+        :param slots: A (games, slots) mask of the properties to mortgage
+        :param thresholds: The amount (per game) at which to stop
+        :return: The value of liquidated properties (per game)
+        """
+        order: np.ndarray = np.argsort(np.where(slots, self.acquired[games], UNORDERED), axis=1)
+        unmortgaged: np.ndarray = np.take_along_axis(slots & ~self.mortgaged[games], order, axis=1)
+        value: np.ndarray = np.where(unmortgaged, PRICE[order] / 2, 0.0)
+        # A property is mortgaged if the properties before it did not reach the threshold
+        mortgaging: np.ndarray = unmortgaged & (np.cumsum(value, axis=1) - value < thresholds[:, None])
+
+        selection: np.ndarray = np.zeros_like(slots)
+        np.put_along_axis(selection, order, mortgaging, axis=1)
+        self.sell_and_mortgage(games, players, selection)
+        return (value * mortgaging).sum(axis=1)
+
+    def force_mortgage(self, games: np.ndarray, players: np.ndarray, thresholds: np.ndarray) -> None:
+        """
+        Mortgage properties from the least to the most valuable class
+        (see MortgageManager.force_mortgage)
+
+        :param games: The games in which to mortgage
+        :param players: The player (per game) who is short of money
+        :param thresholds: The amount of money required (per game)
+        :return: None
+        """
+        if len(games) == 0:
+            return
+
+        liquidated: np.ndarray = self.liquidate(games, players, self.classify(games, players)[0] == CLASS_F,
+                                                thresholds)
+        short: np.ndarray = liquidated < thresholds
+        games, players, thresholds = games[short], players[short], thresholds[short]
+        for property_class in (CLASS_E, CLASS_D, CLASS_C, CLASS_B, CLASS_A):
+            self.liquidate(games, players, self.classify(games, players)[0] == property_class, thresholds)
+
+    def bankrupt(self, games: np.ndarray, players: np.ndarray) -> None:
+        """
+        Release each player's properties and remove them from their game
+
+        :param games: The games in which a player went bankrupt
+        :param players: The bankrupt player (per game)
+        :return: None
+        """
+        self.active[games, players] = False
+        released: np.ndarray = self.owners[games] == players[:, None]
+        self.owners[games] = np.where(released, -1, self.owners[games])
+        self.mortgaged[games] &= ~released
+
+    def tile_owners(self) -> np.ndarray:
+        """
+        :return: The owner of every tile on the board, per game (-1 if unowned)
+        """
+        owners: np.ndarray = np.full((self.games, BOARD_TABLES.size), -1, dtype=np.int64)
+        owners[:, SLOT_TILES] = self.owners
+        return owners
+
+    def state(self, game: int, names: List[str]) -> tuple:
+        """
+        :param game: The game to describe
+        :param names: The names of the game's players, by seat
+        :return: The active players (name, balance, position) and every
+            tile's (owner name, houses, mortgaged), comparable with CompactGame.state()
+        """
+        owners: np.ndarray = self.tile_owners()[game]
+        houses: np.ndarray = np.zeros(BOARD_TABLES.size, dtype=np.int64)
+        houses[SLOT_TILES] = self.houses[game]
+        mortgaged: np.ndarray = np.zeros(BOARD_TABLES.size, dtype=bool)
+        mortgaged[SLOT_TILES] = self.mortgaged[game]
+        return (tuple([(names[player], int(self.balances[game, player]), int(self.positions[game, player]))
+                       for player in np.nonzero(self.active[game])[0]]),
+                tuple([(names[owners[tile]] if owners[tile] != -1 else None, int(houses[tile]), bool(mortgaged[tile]))
+                       for tile in range(BOARD_TABLES.size)]))
+
+    def winners(self) -> np.ndarray:
+        """
+        :return: The winning player of every game (-1 if unfinished)
+        """
+        return np.where(self.active.sum(axis=1) == 1, np.argmax(self.active, axis=1), -1)
+
+    def statistics(self) -> Dict[str, Union[int, float, List[float], Dict[int, int]]]:
+        """
+        :return: The number of games, unfinished games, the win rate of each
+            seat, the mean game length and a histogram of game lengths
+        """
+        winners: np.ndarray = self.winners()
+        lengths, counts = np.unique(self.turns, return_counts=True)
+        return {
+            "games": self.games,
+            "unfinished": int((winners == -1).sum()),
+            "win_rates": [float((winners == player).mean()) for player in range(self.player_count)],
+            "mean_turns": float(self.turns.mean()),
+            "turn_counts": {int(length): int(count) for length, count in zip(lengths, counts)}
+        }
+
+
+def cross_check(seed: int, **kwargs) -> Union[int, None]:
+    """
+    Play a batch of seeded games with CompactGame and LockstepGames, giving
+    both engines the same configurations and the same dice, and compare
+    the states of every game after every turn.
+
+    :param seed: The seed for the batch
+    :param kwargs:
+        games=int: The number of games (default 16)
+        players=List[str]: names of the players (default: 4 players)
+        max_turns=int: The number of turns to compare (default 1000)
+    :return: The first turn at which the engines disagree in any game, or None if they agree
+    """
+    count: int = kwargs["games"] if "games" in kwargs else 16
+    players: List[str] = kwargs["players"] if "players" in kwargs else ["Player 1", "Player 2", "Player 3",
+                                                                        "Player 4"]
+    max_turns: int = kwargs["max_turns"] if "max_turns" in kwargs else 1000
+
+    compacts: List[CompactGame] = [CompactGame(players=players, seed=game_seed)
+                                   for game_seed in spawn_seeds(seed, count)]
+    games: LockstepGames = LockstepGames(count, len(players), seed=seed)
+    games.mortgage_to_build[:] = [compact.mortgage_to_build for compact in compacts]
+    games.quick_builder[:] = [compact.quick_builder for compact in compacts]
+    games.insurance_rate[:] = [compact.insurance_rate for compact in compacts]
+
+    for turn_number in range(1, max_turns + 1):
+        dice: np.ndarray = np.zeros(count, dtype=np.int64)
+        for game, compact in enumerate(compacts):
+            if len(compact.players) > 1:
+                # Read the two dice the game is about to roll
+                rng_state: tuple = compact.rng.getstate()
+                dice[game] = compact.rng.randrange(1, 7) + compact.rng.randrange(1, 7)
+                compact.rng.setstate(rng_state)
+                compact.run_next_turn()
+
+        playing: bool = games.step(max_turns, dice)
+        for game, compact in enumerate(compacts):
+            if games.state(game, players) != compact.state() or games.turns[game] != compact.turn_number:
+                return turn_number
+        if not playing:
+            return None
+
+    return None
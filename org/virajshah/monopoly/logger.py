@@ -1,13 +1,25 @@
-from typing import List, IO
+from collections import deque
+from typing import Deque, Dict, IO, Iterator
 
 from org.virajshah.monopoly.html import DOMElement
 import os
 
-printing_enabled: bool = False
 include_date: bool = True
 include_time: bool = True
 
-logs: List["Log"] = []
+DEBUG: int = 10
+INFO: int = 20
+WARNING: int = 30
+DISABLED: int = 100
+
+# The level each type of log is recorded at, unless specified with level=int
+TYPE_LEVELS: Dict[str, int] = {
+    "default": DEBUG,
+    "player-update": DEBUG,
+    "transaction": INFO,
+    "trade": INFO,
+    "bankrupted": WARNING
+}
 
 
 class Log:
@@ -17,7 +29,7 @@ class Log:
 
         :param message: The message to be logged
         :param kwargs:
-            type=str: Options: (default), transaction, player-update, bankrupted
+            type=str: Options: (default), transaction, player-update, bankrupted, trade
         """
         self.message: str = message
         self.type: str = kwargs["type"] if "type" in kwargs else "default"
@@ -64,31 +76,74 @@ class Log:
 
 
 class Logger:
-    @staticmethod
-    def log(message: str, **kwargs) -> None:
+    def __init__(self, **kwargs):
+        """
+        Initialize a logger. Each MonopolyGame owns its own logger.
+
+        :param kwargs:
+            level=int: The minimum level of logs to record (default DEBUG).
+                Use DISABLED to skip logging (and message formatting) entirely.
+            capacity=int: Only keep the most recent `capacity` logs (default unbounded)
+            printing=bool: Print each log as it is recorded (default False)
+        """
+        self.level: int = kwargs["level"] if "level" in kwargs else DEBUG
+        self.printing_enabled: bool = kwargs["printing"] if "printing" in kwargs else False
+        self.logs: Deque[Log] = deque(maxlen=kwargs["capacity"] if "capacity" in kwargs else None)
+
+    def enabled_for(self, log_type: str) -> bool:
+        """
+        :param log_type: The type of log
+        :return: True if logs of the specified type would be recorded
+        """
+        return TYPE_LEVELS.get(log_type, DEBUG) >= self.level
+
+    def log(self, message: str, *args, **kwargs) -> None:
         """
-        Log a message to the list of logs
+        Log a message to the list of logs. The message is only formatted
+        if the log is recorded.
 
-        :param message: The message to append
+        :param message: The message (or format string) to append
+        :param args: Arguments to format the message with
         :param kwargs:
             type=...: The type of log being appended
+            level=int: The level of the log (defaults to the level of the type)
         :return: None
         """
-        if printing_enabled:
+        level: int = kwargs["level"] if "level" in kwargs else TYPE_LEVELS.get(kwargs.get("type", "default"), DEBUG)
+        if level < self.level:
+            return
+        if args:
+            message = message.format(*args)
+        if self.printing_enabled:
             print(message)
-        logs.append(Log(message, **kwargs))
+        self.logs.append(Log(message, **kwargs))
 
-    @staticmethod
-    def enable_printing() -> None:
+    def enable_printing(self) -> None:
         """
         Enables printing
         :return: None
         """
-        global printing_enabled
-        printing_enabled = True
+        self.printing_enabled = True
+
+    def clear(self) -> None:
+        """
+        Discard all recorded logs
+        :return: None
+        """
+        self.logs.clear()
 
-    @staticmethod
-    def save(filename: str) -> None:
+    def html_logs(self) -> Iterator[DOMElement]:
+        """
+        :return: A generator of the HTML element for each log, created as it is consumed
+        """
+        log_num: int = 1
+        for log in self.logs:
+            yield DOMElement("div", id="log-{}".format(log_num), children=[
+                DOMElement("span", style="padding-left:2em", children=[str(log_num)]),
+                DOMElement("pre", classname="log", style=log.css(), children=[log.message])])
+            log_num += 1
+
+    def save(self, filename: str) -> None:
         """
         Save the logs to a file.
 
@@ -96,14 +151,12 @@ class Logger:
             Note: *.html will generate an html doc for the logs
         :return: None
         """
-        print("Saving {} logs".format(len(logs)))
+        print("Saving {} logs".format(len(self.logs)))
         ext: str = filename.split(".")[-1] if "." in filename else "txt"
         buffer: IO = open(filename, "w")
         if ext in ["txt", "log"]:
-            text: str = ""
-            for log in logs:
-                text += str(log) + "\n"
-            buffer.write(text)
+            for log in self.logs:
+                buffer.write(str(log) + "\n")
         elif ext in ["html", "htm"]:
             game_board_fp: IO = open(os.path.dirname(os.path.realpath(__file__)) + "/html_components/game-board.html",
                                      "r")
@@ -111,15 +164,6 @@ class Logger:
             game_board_fp.close()
             del game_board_fp
 
-            logs_html_list: List[DOMElement] = []
-            log_num = 1
-            for log in logs:
-                logs_html_list.append(
-                    DOMElement("div", id="log-{}".format(log_num), children=[
-                        DOMElement("span", style="padding-left:2em", children=[str(log_num)]),
-                        DOMElement("pre", classname="log", style=log.css(), children=[log.message])]))
-                log_num += 1
-
             page: DOMElement = DOMElement("html", lang="en-US", children=[
                 DOMElement("head", children=[
                     DOMElement("meta", charset="utf-8"),
@@ -183,7 +227,7 @@ class Logger:
                         DOMElement("a", children=["#"],
                                    onclick="window.location = '#log-' + prompt('Jump to log #:');"),
                         DOMElement("a", children=["Top"], href="#log-1"),
-                        DOMElement("a", children=["Bottom"], href="#log-{}".format(len(logs))),
+                        DOMElement("a", children=["Bottom"], href="#log-{}".format(len(self.logs))),
                         DOMElement("a", children=["Game Board"],
                                    onclick="document.getElementById('game-board-wrapper').hidden=false")
                     ]),
@@ -194,9 +238,10 @@ class Logger:
                                    DOMElement("button", children=["Close"],
                                               onclick="document.getElementById('game-board-wrapper').hidden=true")
                                ], hidden="false"),
-                    DOMElement("pre", classname="log-list", children=logs_html_list)
+                    DOMElement("pre", classname="log-list", children=self.html_logs())
                 ])
             ])
-            buffer.write(str(page))
+            # Each log is rendered and written as it is reached
+            page.render_to(buffer)
         buffer.close()
         print("Logs saved to {}".format(filename))
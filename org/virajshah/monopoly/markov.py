@@ -0,0 +1,122 @@
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from org.virajshah.monopoly.core import BOARD_TABLES, JAIL_INDEX, BoardTables
+
+IN_JAIL: int = BOARD_TABLES.size  # The state of a prisoner waiting for doubles (only used with imprison=True)
+STATES: int = BOARD_TABLES.size + 1
+
+# (sum, probability, doubles) of every outcome of two six-sided dice
+DICE: List[Tuple[int, float, bool]] = [(roll1 + roll2, 1 / 36, roll1 == roll2)
+                                       for roll1 in range(1, 7) for roll2 in range(1, 7)]
+
+
+class BoardChain:
+    def __init__(self, **kwargs):
+        """
+        The Markov chain of a single player's position at the end of each
+        of their turns, under the movement rules of MonopolyGame.run_next_turn:
+        two six-sided dice, wrapping at GO, and GO_TO_JAIL sending the player
+        to JAIL_INDEX.
+
+        :param kwargs:
+            imprison=bool: Landing on GO_TO_JAIL makes the player a prisoner,
+                who only moves again after rolling doubles (default False,
+                since run_next_turn never sets Player.prisoner)
+        """
+        self.imprison: bool = kwargs["imprison"] if "imprison" in kwargs else False
+        # movement[s, t]: The probability that a turn starting in state s moves the player onto tile t
+        self.movement: np.ndarray = np.zeros((STATES, BOARD_TABLES.size))
+        # transition[s, t]: The probability that a turn starting in state s ends in state t
+        self.transition: np.ndarray = np.zeros((STATES, STATES))
+        self._stationary: Union[np.ndarray, None] = None
+
+        for state in range(STATES):
+            for roll, probability, doubles in DICE:
+                if state == IN_JAIL and not doubles:
+                    self.transition[state, IN_JAIL] += probability
+                    continue
+
+                origin: int = JAIL_INDEX if state == IN_JAIL else state
+                tile: int = (origin + roll) % BOARD_TABLES.size
+                self.movement[state, tile] += probability
+
+                if BOARD_TABLES.go_to_jail[tile]:
+                    self.transition[state, IN_JAIL if self.imprison else JAIL_INDEX] += probability
+                else:
+                    self.transition[state, tile] += probability
+
+    def stationary(self) -> np.ndarray:
+        """
+        :return: The long-run probability of ending a turn in each state
+            (board indexes, followed by IN_JAIL)
+        """
+        if self._stationary is None:
+            # Solve pi (P - I) = 0 subject to sum(pi) = 1
+            system: np.ndarray = np.vstack([(self.transition - np.eye(STATES)).T, np.ones(STATES)])
+            target: np.ndarray = np.zeros(STATES + 1)
+            target[-1] = 1
+            self._stationary = np.linalg.lstsq(system, target, rcond=None)[0]
+        return self._stationary
+
+    def landing_probabilities(self) -> np.ndarray:
+        """
+        :return: The long-run probability that a turn moves the player onto
+            each board index (before being sent to jail)
+        """
+        return self.stationary() @ self.movement
+
+    def rent_table(self) -> np.ndarray:
+        """
+        :return: A (BOARD_SIZE, 6) array of the expected rent paid to the
+            owner of each tile, per opponent turn, by number of houses
+            (0 for tiles which do not collect rent)
+        """
+        table: np.ndarray = np.zeros((BOARD_TABLES.size, 6))
+        landing: np.ndarray = self.landing_probabilities()
+        for tile in BOARD_TABLES.property_tiles:
+            table[tile] = landing[tile] * np.array(BOARD_TABLES.rents[tile])
+        return table
+
+    def expected_rent(self, tile: int, houses: int = 0) -> float:
+        """
+        :param tile: The board index of the property
+        :param houses: The number of houses on the property (5 = hotel)
+        :return: The rent the owner expects to collect per opponent turn
+        """
+        return float(self.rent_table()[tile, houses])
+
+    def set_returns(self, houses: int) -> Dict[int, float]:
+        """
+        :param houses: The number of houses on every property of the set
+        :return: The expected rent per opponent turn of each complete set
+            (by set id, see compact.SET_OF) per dollar invested in it
+        """
+        table: np.ndarray = self.rent_table()
+        tables: BoardTables = BOARD_TABLES
+        rent: List[float] = [0.0] * len(tables.set_id_sizes)
+        invested: List[int] = [0] * len(tables.set_id_sizes)
+        for tile in tables.property_tiles:
+            rent[tables.set_of[tile]] += table[tile, houses]
+            invested[tables.set_of[tile]] += tables.prices[tile] + houses * tables.house_costs[tile]
+        return {set_id: float(rent[set_id] / invested[set_id]) for set_id in range(len(tables.set_id_sizes))}
+
+    def summary(self, houses: int = 0) -> str:
+        """
+        :param houses: The number of houses to report rents for
+        :return: A human readable table of landing probabilities and expected rents
+        """
+        landing: np.ndarray = self.landing_probabilities()
+        table: np.ndarray = self.rent_table()
+        out: str = ""
+        for tile in range(BOARD_TABLES.size):
+            out += "{:>2} {:<24} {:.4%}".format(tile, BOARD_TABLES.names[tile], landing[tile])
+            if tile in BOARD_TABLES.property_tiles:
+                out += " ${:.2f}/turn".format(table[tile, houses])
+            out += "\n"
+        return out
+
+
+if __name__ == "__main__":
+    print(BoardChain().summary())
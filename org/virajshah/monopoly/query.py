@@ -0,0 +1,139 @@
+import glob
+import os
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from org.virajshah.monopoly.core import BOARD_TABLES
+from org.virajshah.monopoly.eventlog import ColumnReader
+
+# (mortgage_to_build, quick_builder, insurance rate bucket)
+ConfigurationKey = Tuple[bool, bool, int]
+
+
+class ResultSet:
+    def __init__(self, directory: str):
+        """
+        Open every result file recorded by a batch run (see
+        batch_sim.ChunkRecorder). Files are memory-mapped and read one
+        chunk at a time, so queries do not load whole files into memory.
+
+        :param directory: The directory the batch was recorded to
+        """
+        self.directory: str = directory
+        self.turns: List[ColumnReader] = self.open("turns")
+        self.games: List[ColumnReader] = self.open("games")
+        self.players: List[ColumnReader] = self.open("players")
+        self.investments: List[ColumnReader] = self.open("investments")
+
+    def open(self, extension: str) -> List[ColumnReader]:
+        """
+        :param extension: The kind of result file
+        :return: A reader for every file of that kind in the directory
+        """
+        return [ColumnReader(filename)
+                for filename in sorted(glob.glob(os.path.join(self.directory, "*." + extension)))]
+
+    def landing_frequency(self) -> List[int]:
+        """
+        :return: The number of times a player moved onto each board index
+            (players who stayed in jail did not move)
+        """
+        counts: Counter = Counter()
+        for reader in self.turns:
+            for chunk in range(len(reader.chunks)):
+                columns: Dict[str, memoryview] = reader.chunk_columns(chunk)
+                if any(columns["origin_in_jail"]):
+                    counts.update([destination for destination, jailed, roll1, roll2 in
+                                   zip(columns["destination"], columns["origin_in_jail"], columns["dice_roll1"],
+                                       columns["dice_roll2"]) if not jailed or roll1 == roll2])
+                else:
+                    counts.update(columns["destination"])
+        return [counts[index] for index in range(BOARD_TABLES.size)]
+
+    def rent_income(self) -> Dict[str, int]:
+        """
+        :return: The total rent collected on each property
+        """
+        income: Counter = Counter()
+        for reader in self.investments:
+            for chunk in range(len(reader.chunks)):
+                columns: Dict[str, memoryview] = reader.chunk_columns(chunk)
+                for prop, rent in zip(columns["property"], columns["rent_collected"]):
+                    income[prop] += rent
+        return {BOARD_TABLES.names[prop]: rent for prop, rent in sorted(income.items())}
+
+    def purchases(self) -> Dict[str, int]:
+        """
+        :return: The number of times each property was purchased
+        """
+        counts: Counter = Counter()
+        for reader in self.investments:
+            for chunk in range(len(reader.chunks)):
+                counts.update(reader.chunk_columns(chunk)["property"])
+        return {BOARD_TABLES.names[prop]: count for prop, count in sorted(counts.items())}
+
+    def configuration_records(self, buckets: int = 5) -> Dict[ConfigurationKey, Tuple[int, int]]:
+        """
+        :param buckets: The number of equal-width buckets to split
+            insurance rates (0 to 0.25) into
+        :return: The number of players, and the number of winners, with
+            each PlayerConfiguration
+        """
+        players: Counter = Counter()
+        wins: Counter = Counter()
+        for reader in self.players:
+            for chunk in range(len(reader.chunks)):
+                columns: Dict[str, memoryview] = reader.chunk_columns(chunk)
+                for mortgage_to_build, quick_builder, insurance_rate, won in zip(
+                        columns["mortgage_to_build"], columns["quick_builder"], columns["insurance_rate"],
+                        columns["won"]):
+                    key: ConfigurationKey = (bool(mortgage_to_build), bool(quick_builder),
+                                             min(buckets - 1, int(insurance_rate * 4 * buckets)))
+                    players[key] += 1
+                    wins[key] += won
+        return {key: (players[key], wins[key]) for key in sorted(players)}
+
+    def win_rates_by_configuration(self, buckets: int = 5) -> Dict[ConfigurationKey, float]:
+        """
+        :param buckets: The number of equal-width buckets to split
+            insurance rates (0 to 0.25) into
+        :return: The fraction of players with each PlayerConfiguration who won their game
+        """
+        return {key: wins / players for key, (players, wins) in self.configuration_records(buckets).items()}
+
+    def game_lengths(self) -> Dict[int, int]:
+        """
+        :return: A histogram of the number of turns played per game
+        """
+        counts: Counter = Counter()
+        for reader in self.games:
+            for chunk in range(len(reader.chunks)):
+                counts.update(reader.chunk_columns(chunk)["turns"])
+        return dict(sorted(counts.items()))
+
+    def unfinished_games(self) -> int:
+        """
+        :return: The number of games which ended without a winner: those
+            abandoned at the turn limit (MAX_TURNS) and those ended as a
+            STALEMATE (result files do not record which of the two it was)
+        """
+        unfinished: int = 0
+        for reader in self.games:
+            for chunk in range(len(reader.chunks)):
+                unfinished += sum([1 for winner in reader.chunk_columns(chunk)["winner"] if winner == -1])
+        return unfinished
+
+    def close(self) -> None:
+        """
+        Close every result file
+
+        :return: None
+        """
+        for reader in self.turns + self.games + self.players + self.investments:
+            reader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
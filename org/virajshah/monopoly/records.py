@@ -1,8 +1,12 @@
 from abc import ABC
-from typing import List
+from typing import List, Tuple, Union
 
 
 class TurnHistoryRecord:
+    # Slots, and lists allocated on first use, keep the many records of a long game small
+    __slots__ = ("turn_number", "dice_roll1", "dice_roll2", "origin", "destination", "origin_in_jail",
+                 "destination_in_jail", "initial_balance", "recent_balance", "_new_properties", "_lost_properties")
+
     def __init__(self):
         self.turn_number: int = 0
         self.dice_roll1: int = 0
@@ -13,18 +17,156 @@ class TurnHistoryRecord:
         self.destination_in_jail: bool = False
         self.initial_balance: int = 0
         self.recent_balance: int = 0
-        self.new_properties: List[str] = []
-        self.lost_properties: List[str] = []
+        self._new_properties: Union[List[str], None] = None
+        self._lost_properties: Union[List[str], None] = None
+
+    @property
+    def new_properties(self) -> List[str]:
+        """
+        :return: The names of the properties acquired during the turn
+        """
+        if self._new_properties is None:
+            self._new_properties = []
+        return self._new_properties
+
+    @new_properties.setter
+    def new_properties(self, new_properties: List[str]) -> None:
+        self._new_properties = new_properties
+
+    @property
+    def lost_properties(self) -> List[str]:
+        """
+        :return: The names of the properties lost during the turn
+        """
+        if self._lost_properties is None:
+            self._lost_properties = []
+        return self._lost_properties
+
+    @lost_properties.setter
+    def lost_properties(self, lost_properties: List[str]) -> None:
+        self._lost_properties = lost_properties
+
+
+class PlayerStatistics:
+    __slots__ = ("turns", "doubles", "jail_visits", "rent_paid", "rent_received", "landings")
+
+    def __init__(self, board_size: int = 40):
+        """
+        Running totals of a player's turns, kept for the whole game
+        however much of Player.turn_history is kept
+
+        :param board_size: The number of tiles on the board
+        """
+        self.turns: int = 0
+        self.doubles: int = 0
+        self.jail_visits: int = 0  # Turns which ended with the player being sent to jail
+        self.rent_paid: int = 0
+        self.rent_received: int = 0
+        self.landings: List[int] = [0] * board_size  # The number of times the player moved onto each tile
+
+    def __str__(self):
+        return "Turns={} Doubles={} JailVisits={} RentPaid=${} RentReceived=${}".format(
+            self.turns, self.doubles, self.jail_visits, self.rent_paid, self.rent_received)
+
+
+class GameSnapshot:
+    __slots__ = ("turn_number", "curr_player", "last_change_turn", "rng_state", "names", "balances", "positions",
+                 "prisoners", "configurations", "active", "bankrupted", "properties", "houses", "mortgaged",
+                 "purchased")
+
+    def __init__(self):
+        """
+        The essential state of a MonopolyGame (see MonopolyGame.snapshot).
+        Players are identified by seat and tiles by board index, and every
+        field is a plain value or tuple, so snapshots can be pickled.
+        """
+        self.turn_number: int = 0
+        self.curr_player: int = -1
+        self.last_change_turn: int = 0
+        self.rng_state: tuple = ()
+        # By seat
+        self.names: Tuple[str, ...] = ()
+        self.balances: Tuple[int, ...] = ()
+        self.positions: Tuple[int, ...] = ()
+        self.prisoners: Tuple[bool, ...] = ()
+        self.configurations: Tuple[tuple, ...] = ()  # See PlayerConfiguration.state()
+        self.properties: Tuple[Tuple[int, ...], ...] = ()  # Board indexes, in the order they were acquired
+        # Seats, in game order
+        self.active: Tuple[int, ...] = ()
+        self.bankrupted: Tuple[int, ...] = ()
+        # By board index
+        self.houses: Tuple[int, ...] = ()
+        self.mortgaged: int = 0  # Bitmask
+        self.purchased: Tuple[int, ...] = ()  # The turn each owned property was purchased (for the tracker)
+
+
+class EconomySnapshot:
+    __slots__ = ("turn_number", "players", "cash", "owned_properties", "mortgaged_properties", "mortgaged_value",
+                 "houses", "hotels")
+
+    def __init__(self):
+        self.turn_number: int = 0
+        self.players: int = 0
+        self.cash: int = 0  # Money in circulation (the active players' balances)
+        self.owned_properties: int = 0
+        self.mortgaged_properties: int = 0
+        self.mortgaged_value: int = 0  # What the bank paid out for the mortgaged properties
+        self.houses: int = 0
+        self.hotels: int = 0
+
+    def __str__(self):
+        return "Turn={} Players={} Cash=${} Owned={} Mortgaged={}/${} Houses={} Hotels={}".format(
+            self.turn_number, self.players, self.cash, self.owned_properties, self.mortgaged_properties,
+            self.mortgaged_value, self.houses, self.hotels)
+
+
+class GameOutcome:
+    __slots__ = ("reason", "turn_number", "winner", "ranking")
+
+    def __init__(self):
+        self.reason: str = "WINNER"  # WINNER, MAX_TURNS or STALEMATE
+        self.turn_number: int = 0
+        self.winner: Union[str, None] = None  # None unless the reason is WINNER
+        self.ranking: List[Tuple[str, int]] = []  # (name, net worth) of every player, best first
+
+    def __str__(self):
+        out: str = "Reason={} Turn={} Winner={}".format(self.reason, self.turn_number, self.winner)
+        for place, (name, net_worth) in enumerate(self.ranking):
+            out += "\n\t{}. {} (${})".format(place + 1, name, net_worth)
+        return out
 
 
 class InvestmentRecord:
+    __slots__ = ("property", "purchased_turn", "purchased_price", "status", "owner", "_transactions",
+                 "rent_collected")
+
     def __init__(self):
         self.property: str = ""
         self.purchased_turn: int = 0
         self.purchased_price: int = 0
         self.status: str = "VOID"
         self.owner: str = ""
-        self.transactions: List["TransactionRecord"] = []
+        self._transactions: Union[List["TransactionRecord"], None] = None  # Allocated by the first transaction
+        self.rent_collected: int = 0  # The sum of all transaction amounts
+
+    @property
+    def transactions(self) -> List["TransactionRecord"]:
+        """
+        :return: The rent transactions on the record
+        """
+        if self._transactions is None:
+            self._transactions = []
+        return self._transactions
+
+    @transactions.setter
+    def transactions(self, transactions: List["TransactionRecord"]) -> None:
+        self._transactions = transactions
+
+    def transaction_count(self) -> int:
+        """
+        :return: The number of rent transactions on the record
+        """
+        return len(self._transactions) if self._transactions is not None else 0
 
     def __str__(self):
         out: str = "Property={} Purchased={}/${} Owner={} Status={} Transactions=" \
@@ -33,13 +175,15 @@ class InvestmentRecord:
                     self.purchased_price,
                     self.owner, self.status)
 
-        for transaction in self.transactions:
+        for transaction in self._transactions or []:
             out += "\n\t" + str(transaction)
 
         return out
 
 
 class TransactionRecord(ABC):
+    __slots__ = ("payer", "recipient", "amount")
+
     def __init__(self):
         self.payer: str = ""
         self.recipient: str = ""
@@ -0,0 +1,193 @@
+import random
+import time
+from typing import Callable, List, Set, Tuple, Union, cast
+
+from org.virajshah.monopoly.core import DefaultStrategy, MonopolyGame, Player, Property, spawn_seeds
+from org.virajshah.monopoly.logger import DISABLED, Logger
+from org.virajshah.monopoly.records import GameSnapshot
+
+# A candidate decision, applied to the copy of the deciding player in a rollout game
+Action = Callable[[MonopolyGame, Player], None]
+
+
+class RolloutPlanner:
+    def __init__(self, **kwargs):
+        """
+        Make a player's decisions by Monte Carlo rollouts: every candidate
+        action is applied to a copy of the game (see MonopolyGame.snapshot),
+        which is then played on for a few turns by the default rules. The
+        action with the best mean net worth for the player wins. Every
+        candidate is played against the same dice, so that the comparison
+        is between actions rather than luck.
+
+        Rollouts start from the next player's turn, so the rest of the
+        deciding player's turn is not played in them.
+
+        Assign a RolloutStrategy to Player.strategy to play by a planner.
+
+        :param kwargs:
+            rollouts=int: The most rollouts per candidate action (default 16)
+            depth=int: The number of turns played per rollout (default 40)
+            time_budget=float: Stop starting new rounds of rollouts (one per
+                candidate) after this many seconds (default: no limit).
+                At least one round is always played.
+            seed=int: The seed for the rollouts' dice (default: drawn from the global random module)
+        """
+        self.rollouts: int = kwargs["rollouts"] if "rollouts" in kwargs else 16
+        self.depth: int = kwargs["depth"] if "depth" in kwargs else 40
+        self.time_budget: Union[float, None] = kwargs["time_budget"] if "time_budget" in kwargs else None
+        self.rng: random.Random = random.Random(kwargs["seed"] if "seed" in kwargs else random.getrandbits(64))
+        self.child: Union[MonopolyGame, None] = None  # Reused by every rollout of games with the same players
+        self.decisions: int = 0
+        self.rollouts_played: int = 0
+        # (game, turn, board indexes) of the properties traded this turn, so that trades are not undone
+        self.traded: Tuple[int, int, Set[int]] = (0, 0, set())
+
+    def rollout_game(self, snapshot: GameSnapshot) -> MonopolyGame:
+        """
+        :param snapshot: The state to roll out from
+        :return: A game to play rollouts in (reused while the players are the same)
+        """
+        child: Union[MonopolyGame, None] = self.child
+        if child is None or tuple([player.name for player in sorted(child.players + child.bankrupted_players,
+                                                                    key=lambda player: player.seat)]) \
+                != snapshot.names:
+            child = MonopolyGame.from_snapshot(snapshot, logger=Logger(level=DISABLED), history_length=0)
+            self.child = child
+        return child
+
+    def evaluate(self, game: MonopolyGame, player: Player, actions: List[Action]) -> List[float]:
+        """
+        :param game: The game being decided in
+        :param player: The deciding player
+        :param actions: The candidate actions
+        :return: The player's mean net worth after the rollouts of each action
+        """
+        snapshot: GameSnapshot = game.snapshot()
+        child: MonopolyGame = self.rollout_game(snapshot)
+        seeds: List[int] = spawn_seeds(self.rng.getrandbits(64), self.rollouts)
+        totals: List[float] = [0.0] * len(actions)
+        start: float = time.perf_counter()
+        played: int = 0
+
+        for seed in seeds:
+            for index, action in enumerate(actions):
+                child.restore(snapshot)
+                child.rng.seed(seed)
+                rollout_player: Player = next(other for other in child.players if other.seat == player.seat)
+                action(child, rollout_player)
+                for _ in range(self.depth):
+                    if child.finished or not rollout_player.in_game:
+                        break
+                    child.run_next_turn()
+                totals[index] += rollout_player.net_worth()
+            played += 1
+            if self.time_budget is not None and time.perf_counter() - start >= self.time_budget:
+                break
+
+        self.decisions += 1
+        self.rollouts_played += played * len(actions)
+        return [total / played for total in totals]
+
+    def choose(self, game: MonopolyGame, player: Player, actions: List[Action]) -> int:
+        """
+        :param game: The game being decided in
+        :param player: The deciding player
+        :param actions: The candidate actions
+        :return: The index of the action with the best mean outcome (the
+            earliest on a tie)
+        """
+        scores: List[float] = self.evaluate(game, player, actions)
+        return scores.index(max(scores))
+
+    def should_buy(self, game: MonopolyGame, player: Player, prop: Property) -> bool:
+        """
+        :param game: The game being decided in
+        :param player: The player who landed on the property
+        :param prop: The unowned property
+        :return: True if buying does at least as well as passing
+        """
+        def buy(rollout: MonopolyGame, rollout_player: Player) -> None:
+            rollout.buy_property(rollout_player, cast(Property, rollout.board[prop.index]))
+
+        def skip(rollout: MonopolyGame, rollout_player: Player) -> None:
+            pass
+
+        return self.choose(game, player, [buy, skip]) == 0
+
+    def houses_to_build(self, game: MonopolyGame, player: Player) -> Union[int, None]:
+        """
+        :param game: The game being decided in
+        :param player: The player about to build
+        :return: The most houses the player should build this turn, or None
+            to build as many as the default rules would
+        """
+        snapshot: GameSnapshot = game.snapshot()
+        child: MonopolyGame = self.rollout_game(snapshot)
+        child.restore(snapshot)
+        rollout_player: Player = next(other for other in child.players if other.seat == player.seat)
+        houses: int = sum(rollout_player.set_index.houses.values())
+        MonopolyGame.build_houses(rollout_player)
+        most: int = sum(rollout_player.set_index.houses.values()) - houses
+        if most <= 0:
+            return None
+
+        # Up to five evenly spaced totals, from building nothing to building everything
+        candidates: List[int] = sorted(set([round(most * step / 4) for step in range(5)]))
+        actions: List[Action] = [lambda rollout, rollout_player, limit=limit: MonopolyGame.build_houses(
+            rollout_player, limit) for limit in candidates]
+        return candidates[self.choose(game, player, actions)]
+
+    def accept_trade(self, game: MonopolyGame, player: Player, receiving: Property, giving: Property) -> bool:
+        """
+        :param game: The game being decided in
+        :param player: The player deciding on the trade
+        :param receiving: The property the player would receive
+        :param giving: The property the player would give away
+        :return: True if trading does better than not trading (properties
+            are traded at most once per turn)
+        """
+        game_id, turn_number, traded = self.traded
+        if game_id != id(game) or turn_number != game.turn_number:
+            traded = set()
+            self.traded = (id(game), game.turn_number, traded)
+        if receiving.index in traded or giving.index in traded:
+            return False
+
+        def trade(rollout: MonopolyGame, rollout_player: Player) -> None:
+            rollout_receiving: Property = cast(Property, rollout.board[receiving.index])
+            rollout_giving: Property = cast(Property, rollout.board[giving.index])
+            other_player: Player = cast(Player, rollout_receiving.owner)
+            rollout_receiving.transfer_ownership(rollout_player)
+            rollout_giving.transfer_ownership(other_player)
+
+        def keep(rollout: MonopolyGame, rollout_player: Player) -> None:
+            pass
+
+        if self.choose(game, player, [keep, trade]) == 1:
+            traded.update([receiving.index, giving.index])
+            return True
+        return False
+
+
+class RolloutStrategy(DefaultStrategy):
+    def __init__(self, **kwargs):
+        """
+        Decide purchases, builds and trades by the rollouts of a
+        RolloutPlanner. Other decisions are the player's configured
+        defaults, and properties the player cannot afford (keeping their
+        insurance) are never bought.
+
+        :param kwargs: Passed on to RolloutPlanner()
+        """
+        self.planner: RolloutPlanner = RolloutPlanner(**kwargs)
+
+    def on_land_unowned(self, game: MonopolyGame, player: Player, prop: Property) -> bool:
+        return super().on_land_unowned(game, player, prop) and self.planner.should_buy(game, player, prop)
+
+    def on_build_phase(self, game: MonopolyGame, player: Player) -> None:
+        MonopolyGame.build_houses(player, self.planner.houses_to_build(game, player))
+
+    def on_trade_offer(self, game: MonopolyGame, player: Player, receiving: Property,
+                       giving: Property) -> Union[bool, None]:
+        return self.planner.accept_trade(game, player, receiving, giving)
@@ -0,0 +1,300 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Union
+
+from org.virajshah.monopoly.core import BOARD_TABLES, MonopolyGame, Player, spawn_seeds
+from org.virajshah.monopoly.eventlog import GAME_COLUMNS, INVESTMENT_COLUMNS, PLAYER_COLUMNS, ColumnWriter, \
+    TurnRecorder
+from org.virajshah.monopoly.logger import DISABLED, Logger
+from org.virajshah.monopoly.records import GameOutcome
+
+DEFAULT_PLAYERS: List[str] = ["Player 1", "Player 2", "Player 3", "Player 4"]
+
+
+class GameResult:
+    def __init__(self):
+        """
+        The outcome of a single simulated game
+        """
+        self.game_id: int = 0
+        self.seed: int = 0
+        self.winner: Union[str, None] = None
+        self.reason: str = "WINNER"  # How the game ended (see GameOutcome)
+        self.ranking: List[Tuple[str, int]] = []
+        self.turns: int = 0
+        self.balances: Dict[str, int] = {}
+        self.rent_collected: Dict[str, int] = {}
+        self.purchases: Dict[str, int] = {}
+
+
+class BatchResult:
+    def __init__(self):
+        """
+        Aggregated outcomes of many simulated games
+        """
+        self.games: int = 0
+        self.unfinished: int = 0
+        self.stalemates: int = 0  # Unfinished games which ended in a stalemate
+        self.leads: Dict[str, int] = {}  # Unfinished games in which each player had the highest net worth
+        self.total_turns: int = 0
+        self.turn_counts: Dict[int, int] = {}
+        self.wins: Dict[str, int] = {}
+        self.total_balances: Dict[str, int] = {}
+        self.rent_collected: Dict[str, int] = {}
+        self.purchases: Dict[str, int] = {}
+
+    def add_game(self, result: GameResult) -> None:
+        """
+        Fold the result of a single game into the aggregate
+
+        :param result: The result of the game
+        :return: None
+        """
+        self.games += 1
+        self.total_turns += result.turns
+        self.turn_counts[result.turns] = self.turn_counts.get(result.turns, 0) + 1
+
+        if result.winner is None:
+            self.unfinished += 1
+            self.stalemates += 1 if result.reason == "STALEMATE" else 0
+            if len(result.ranking) > 0:
+                self.leads[result.ranking[0][0]] = self.leads.get(result.ranking[0][0], 0) + 1
+        else:
+            self.wins[result.winner] = self.wins.get(result.winner, 0) + 1
+
+        for name, balance in result.balances.items():
+            self.total_balances[name] = self.total_balances.get(name, 0) + balance
+        for prop, amount in result.rent_collected.items():
+            self.rent_collected[prop] = self.rent_collected.get(prop, 0) + amount
+        for prop, count in result.purchases.items():
+            self.purchases[prop] = self.purchases.get(prop, 0) + count
+
+    def merge(self, other: "BatchResult") -> None:
+        """
+        Fold another aggregate (typically from another worker) into this one
+
+        :param other: The aggregate to merge
+        :return: None
+        """
+        self.games += other.games
+        self.unfinished += other.unfinished
+        self.stalemates += other.stalemates
+        self.total_turns += other.total_turns
+
+        for turns, count in other.turn_counts.items():
+            self.turn_counts[turns] = self.turn_counts.get(turns, 0) + count
+        for name, wins in other.wins.items():
+            self.wins[name] = self.wins.get(name, 0) + wins
+        for name, leads in other.leads.items():
+            self.leads[name] = self.leads.get(name, 0) + leads
+        for name, balance in other.total_balances.items():
+            self.total_balances[name] = self.total_balances.get(name, 0) + balance
+        for prop, amount in other.rent_collected.items():
+            self.rent_collected[prop] = self.rent_collected.get(prop, 0) + amount
+        for prop, count in other.purchases.items():
+            self.purchases[prop] = self.purchases.get(prop, 0) + count
+
+    def mean_turns(self) -> float:
+        """
+        :return: The average number of turns played per game
+        """
+        return self.total_turns / self.games if self.games else 0.0
+
+    def win_rates(self) -> Dict[str, float]:
+        """
+        :return: The fraction of all games won by each player
+        """
+        return {name: wins / self.games for name, wins in self.wins.items()}
+
+    def __str__(self):
+        """
+        :return: A human readable summary of the batch
+        """
+        out: str = "Games={} Unfinished={} Stalemates={} MeanTurns={:.1f}\n".format(
+            self.games, self.unfinished, self.stalemates, self.mean_turns())
+        for name, rate in sorted(self.win_rates().items()):
+            out += "\t{} won {:.2%}\n".format(name, rate)
+        for name, leads in sorted(self.leads.items()):
+            out += "\t{} led {} unfinished games\n".format(name, leads)
+        for prop, amount in sorted(self.rent_collected.items(), key=lambda item: -item[1]):
+            out += "\t{} collected ${} over {} purchases\n".format(prop, amount, self.purchases.get(prop, 0))
+        return out
+
+
+class ChunkRecorder:
+    def __init__(self, prefix: str):
+        """
+        Record a chunk of games to columnar result files (see eventlog):
+        prefix.turns, prefix.games, prefix.players and prefix.investments
+
+        :param prefix: The path of the files, without an extension
+        """
+        self.turns: TurnRecorder = TurnRecorder(prefix + ".turns")
+        self.games: ColumnWriter = ColumnWriter(prefix + ".games", GAME_COLUMNS)
+        self.players: ColumnWriter = ColumnWriter(prefix + ".players", PLAYER_COLUMNS)
+        self.investments: ColumnWriter = ColumnWriter(prefix + ".investments", INVESTMENT_COLUMNS)
+        self.tiles: Dict[str, int] = {name: index for index, name in enumerate(BOARD_TABLES.names)}
+
+    def record_game(self, game: MonopolyGame, seed: int) -> None:
+        """
+        Record the outcome, players and investments of a finished game
+        (its turns are recorded as they are played)
+
+        :param game: The finished game
+        :param seed: The game's seed
+        :return: None
+        """
+        everyone: List[Player] = sorted(game.players + game.bankrupted_players, key=lambda player: player.seat)
+        seats: Dict[str, int] = {player.name: player.seat for player in everyone}
+        winner: int = game.players[0].seat if len(game.players) == 1 else -1
+
+        self.games.append(game.game_id, seed, game.turn_number, len(everyone), winner)
+        for player in everyone:
+            self.players.append(game.game_id, player.seat, player.configuration.mortgage_to_build,
+                                player.configuration.quick_builder, player.configuration.insurance_rate,
+                                player.seat == winner, player in game.bankrupted_players, player.balance)
+        for record in game.investment_tracker.ledger:
+            self.investments.append(game.game_id, self.tiles[record.property], seats[record.owner],
+                                    record.purchased_turn, record.purchased_price, record.status == "ACTIVE",
+                                    record.transaction_count(), record.rent_collected)
+
+    def close(self) -> None:
+        """
+        Write any buffered rows and close every file
+
+        :return: None
+        """
+        for writer in [self.turns, self.games, self.players, self.investments]:
+            writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def play_game(game_id: int, seed: int, players: List[str], max_turns: int,
+              recorder: Union[ChunkRecorder, None] = None, stalemate_window: Union[int, None] = None) -> GameResult:
+    """
+    Play a single game to completion (or until it is abandoned)
+
+    :param game_id: An identifier for the game within the batch
+    :param seed: The seed for the game's random number generation
+    :param players: The names of the players
+    :param max_turns: The number of turns after which the game is abandoned
+    :param recorder: Record the game to this recorder (default: not recorded)
+    :param stalemate_window: Abandon the game after this many turns without
+        any balance or property changing hands (default: never)
+    :return: The result of the game
+    """
+    # Logs and turn histories are never read in batch runs
+    game: MonopolyGame = MonopolyGame(players=players, seed=seed, logger=Logger(level=DISABLED),
+                                      recorder=recorder.turns if recorder is not None else None, game_id=game_id,
+                                      max_turns=max_turns, stalemate_window=stalemate_window, history_length=0)
+
+    outcome: GameOutcome = game.play()
+
+    if recorder is not None:
+        recorder.record_game(game, seed)
+
+    result: GameResult = GameResult()
+    result.game_id = game_id
+    result.seed = seed
+    result.turns = game.turn_number
+    result.winner = outcome.winner
+    result.reason = outcome.reason
+    result.ranking = outcome.ranking
+    result.balances = {player.name: player.balance for player in game.players + game.bankrupted_players}
+
+    for record in game.investment_tracker.ledger:
+        result.rent_collected[record.property] = result.rent_collected.get(record.property, 0) + record.rent_collected
+        result.purchases[record.property] = result.purchases.get(record.property, 0) + 1
+
+    return result
+
+
+def play_games(game_ids: List[int], seeds: List[int], players: List[str], max_turns: int,
+               record_dir: Union[str, None] = None, stalemate_window: Union[int, None] = None) -> BatchResult:
+    """
+    Play a chunk of games in the current process and aggregate them
+
+    :param game_ids: The identifiers of the games to play
+    :param seeds: The seed for each game
+    :param players: The names of the players
+    :param max_turns: The number of turns after which a game is abandoned
+    :param record_dir: Record the chunk to result files in this directory (default: not recorded)
+    :param stalemate_window: Abandon games after this many turns without
+        any balance or property changing hands (default: never)
+    :return: The aggregate of all games in the chunk
+    """
+    batch: BatchResult = BatchResult()
+    if record_dir is None:
+        for game_id, seed in zip(game_ids, seeds):
+            batch.add_game(play_game(game_id, seed, players, max_turns, stalemate_window=stalemate_window))
+        return batch
+
+    with ChunkRecorder(os.path.join(record_dir, "games-{:08d}".format(game_ids[0]))) as recorder:
+        for game_id, seed in zip(game_ids, seeds):
+            batch.add_game(play_game(game_id, seed, players, max_turns, recorder, stalemate_window))
+    return batch
+
+
+def run_batch(games: int, **kwargs) -> BatchResult:
+    """
+    Play many games across a pool of worker processes
+
+    :param games: The number of games to play
+    :param kwargs:
+        seed=int: The seed from which every game's seed is derived (default 0)
+        players=List[str]: The names of the players in each game
+        max_turns=int: The number of turns after which a game is abandoned (default 10000)
+        workers=int: The number of worker processes (default: number of CPUs)
+        chunk_size=int: The number of games handed to a worker at a time
+        record_dir=str: Record every chunk of games to result files in this directory (default: not recorded)
+        stalemate_window=int: Abandon games after this many turns without any balance or property
+            changing hands (default: never)
+    :return: The aggregate of all games
+    """
+    seed: int = kwargs["seed"] if "seed" in kwargs else 0
+    players: List[str] = kwargs["players"] if "players" in kwargs else DEFAULT_PLAYERS
+    max_turns: int = kwargs["max_turns"] if "max_turns" in kwargs else 10000
+    workers: int = kwargs["workers"] if "workers" in kwargs else (os.cpu_count() or 1)
+    chunk_size: int = kwargs["chunk_size"] if "chunk_size" in kwargs else max(1, min(100, games // (workers * 4)))
+    record_dir: Union[str, None] = kwargs["record_dir"] if "record_dir" in kwargs else None
+    stalemate_window: Union[int, None] = kwargs["stalemate_window"] if "stalemate_window" in kwargs else None
+
+    # Seeds are derived up front so that results do not depend on scheduling
+    seeds: List[int] = spawn_seeds(seed, games)
+
+    chunks: List[range] = [range(start, min(start + chunk_size, games)) for start in range(0, games, chunk_size)]
+    batch: BatchResult = BatchResult()
+
+    if workers <= 1:
+        for chunk in chunks:
+            batch.merge(play_games(list(chunk), seeds[chunk.start:chunk.stop], players, max_turns, record_dir,
+                                   stalemate_window))
+        return batch
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_games, list(chunk), seeds[chunk.start:chunk.stop], players, max_turns,
+                                   record_dir, stalemate_window) for chunk in chunks]
+        for future in futures:
+            batch.merge(future.result())
+    return batch
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play many Monopoly games across a process pool")
+    parser.add_argument("games", type=int, help="the number of games to play")
+    parser.add_argument("--seed", type=int, default=0, help="the seed for the batch")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="the number of worker processes")
+    parser.add_argument("--max-turns", type=int, default=10000, help="abandon games after this many turns")
+    parser.add_argument("--record-dir", help="record the games to result files in this directory")
+    parser.add_argument("--stalemate-window", type=int,
+                        help="abandon games after this many turns without any money or property changing hands")
+    args = parser.parse_args()
+
+    print(run_batch(args.games, seed=args.seed, workers=args.workers, max_turns=args.max_turns,
+                    record_dir=args.record_dir, stalemate_window=args.stalemate_window))
@@ -0,0 +1,386 @@
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Union, cast
+
+from org.virajshah.monopoly.core import ColoredProperty, MonopolyGame, Player, Property, PropertyManager, \
+    TileAttribute, TradeBroker
+from org.virajshah.monopoly.logger import DISABLED, Logger
+from org.virajshah.monopoly.records import GameSnapshot, TurnHistoryRecord
+from org.virajshah.monopoly.rollout import RolloutPlanner
+from org.virajshah.monopoly.tracker import InvestmentTracker
+
+DEFAULT_PLAYERS: List[str] = ["Player 1", "Player 2", "Player 3", "Player 4"]
+DEFAULT_TOLERANCE: float = 1.5  # A benchmark regresses if it is this many times slower than its baseline
+
+
+class BenchmarkResult:
+    def __init__(self, name: str, unit: str):
+        """
+        The measurements of a single benchmark
+
+        :param name: The name of the benchmark
+        :param unit: What a single operation is (e.g. "turn", "game", "call")
+        """
+        self.name: str = name
+        self.unit: str = unit
+        self.operations: int = 0
+        self.seconds: float = 0.0
+        # Memory still held after the measured work, per operation. Blocks which are allocated and freed again
+        # are not counted: tracemalloc only sees the blocks alive when it takes a snapshot.
+        self.retained_blocks: int = 0
+        self.retained_bytes: int = 0
+        self.peak_bytes: int = 0  # The most memory the measured work held at once, above what was held before it
+
+    def throughput(self) -> float:
+        """
+        :return: The number of operations per second
+        """
+        return self.operations / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Union[str, int, float]]:
+        """
+        :return: The result as a JSON serializable dictionary
+        """
+        return {"name": self.name, "unit": self.unit, "operations": self.operations, "seconds": self.seconds,
+                "throughput": self.throughput(), "retained_blocks": self.retained_blocks,
+                "retained_bytes": self.retained_bytes, "peak_bytes": self.peak_bytes}
+
+    def __str__(self):
+        """
+        :return: A single line summary of the benchmark
+        """
+        return "{:<32} {:>12.1f} {}s/sec {:>10} retained blocks/{} {:>10} retained bytes/{} {:>10.1f} KiB peak" \
+            .format(self.name, self.throughput(), self.unit, self.retained_blocks, self.unit, self.retained_bytes,
+                    self.unit, self.peak_bytes / 1024)
+
+
+class Benchmark:
+    def __init__(self, name: str, unit: str, setup: Callable[[int], Callable[[], int]]):
+        """
+        A benchmark of a single engine hot path
+
+        :param name: The name of the benchmark
+        :param unit: What a single operation is (e.g. "turn", "game", "call")
+        :param setup: Given a seed, builds the state to measure and returns a
+            callable which performs the measured work and returns the
+            number of operations it performed. Only the callable is timed.
+        """
+        self.name: str = name
+        self.unit: str = unit
+        self.setup: Callable[[int], Callable[[], int]] = setup
+
+    def run(self, seeds: List[int]) -> BenchmarkResult:
+        """
+        Time the benchmark once per seed, then measure its memory for the first seed
+
+        :param seeds: The seeds to build states from
+        :return: The measurements
+        """
+        result: BenchmarkResult = BenchmarkResult(self.name, self.unit)
+
+        for seed in seeds:
+            work: Callable[[], int] = self.setup(seed)
+            start: float = time.perf_counter()
+            result.operations += work()
+            result.seconds += time.perf_counter() - start
+
+        work = self.setup(seeds[0])
+        # Tracing starts right before the work, so every traced block was allocated by it and the traced peak
+        # is the work's own (tracemalloc.reset_peak needs Python 3.9)
+        tracemalloc.start()
+        operations: int = work()
+        end_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        after: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        retained: List[tracemalloc.Statistic] = after.filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]).statistics("filename")
+        result.retained_blocks = sum([stat.count for stat in retained]) // max(1, operations)
+        result.retained_bytes = end_bytes // max(1, operations)
+        result.peak_bytes = peak_bytes
+
+        return result
+
+
+def new_game(seed: int) -> MonopolyGame:
+    """
+    :param seed: The seed for the game
+    :return: A fresh game with the default players and logging disabled
+    """
+    return MonopolyGame(players=DEFAULT_PLAYERS, seed=seed, logger=Logger(level=DISABLED))
+
+
+def late_game(seed: int) -> MonopolyGame:
+    """
+    Build a synthetic late-game state: every purchasable property is owned,
+    several sets are complete and built on, and some properties are mortgaged.
+
+    :param seed: The seed for the game and for the synthetic state
+    :return: The game
+    """
+    game: MonopolyGame = new_game(seed)
+    rng: random.Random = random.Random(seed)
+
+    # Deal out whole sets first so that monopolies exist, then everything else
+    for members in game.tables.set_members.values():
+        owner: Player = rng.choice(game.players)
+        for index in members:
+            game.board[index].purchase(owner if rng.random() < 0.75 else rng.choice(game.players))
+    for tile in game.board:
+        if TileAttribute.PROPERTY in tile.attributes and cast(Property, tile).owner is None:
+            tile.purchase(rng.choice(game.players))
+
+    for player in game.players:
+        player.balance = rng.randrange(500, 3000)
+        for prop in player.properties:
+            if isinstance(prop, ColoredProperty) and prop.is_monopoly_completed():
+                prop.houses = rng.randrange(0, 6)
+            elif rng.random() < 0.3:
+                prop.mortgaged = True
+        for prop in player.properties:
+            if isinstance(prop, ColoredProperty) and prop.houses > 0:
+                prop.distribute_houses()
+
+    return game
+
+
+def bench_turns(seed: int) -> Callable[[], int]:
+    game: MonopolyGame = new_game(seed)
+
+    def work() -> int:
+        for _ in range(200):
+            if len(game.players) <= 1:
+                break
+            game.run_next_turn()
+        return game.turn_number
+
+    return work
+
+
+def bench_games(seed: int) -> Callable[[], int]:
+    game: MonopolyGame = new_game(seed)
+
+    def work() -> int:
+        while len(game.players) > 1 and game.turn_number < 1000:
+            game.run_next_turn()
+        return 1
+
+    return work
+
+
+def bench_fork(seed: int) -> Callable[[], int]:
+    game: MonopolyGame = late_game(seed)
+
+    def work() -> int:
+        game.fork(100, seed=seed)
+        return 100
+
+    return work
+
+
+def bench_restore(seed: int) -> Callable[[], int]:
+    game: MonopolyGame = late_game(seed)
+    snapshot: GameSnapshot = game.snapshot()
+    child: MonopolyGame = game.fork(1)[0]
+
+    def work() -> int:
+        for _ in range(500):
+            child.restore(snapshot)
+        return 500
+
+    return work
+
+
+def bench_rollouts(seed: int) -> Callable[[], int]:
+    game: MonopolyGame = late_game(seed)
+    planner: RolloutPlanner = RolloutPlanner(rollouts=8, depth=20, seed=seed)
+
+    def work() -> int:
+        for player in game.players:
+            planner.houses_to_build(game, player)
+        return len(game.players)
+
+    return work
+
+
+def bench_build_houses(seed: int) -> Callable[[], int]:
+    game: MonopolyGame = late_game(seed)
+
+    def work() -> int:
+        for player in game.players:
+            MonopolyGame.build_houses(player)
+        return len(game.players)
+
+    return work
+
+
+def bench_trades(seed: int) -> Callable[[], int]:
+    game: MonopolyGame = late_game(seed)
+
+    def work() -> int:
+        for _ in range(10):
+            for player in game.players:
+                TradeBroker(player).attempt_all_trades()
+        return 10 * len(game.players)
+
+    return work
+
+
+def bench_classify(seed: int) -> Callable[[], int]:
+    game: MonopolyGame = late_game(seed)
+
+    def work() -> int:
+        for _ in range(50):
+            for player in game.players:
+                player.property_classes_version = -1  # Measure classification, not the cache
+                manager: PropertyManager = PropertyManager(player)
+                manager.class_a_properties()
+                manager.class_b_properties()
+                manager.class_c_properties()
+                manager.class_d_properties()
+                manager.class_e_properties()
+                manager.class_f_properties()
+        return 50 * len(game.players)
+
+    return work
+
+
+def bench_tracker(seed: int) -> Callable[[], int]:
+    rng: random.Random = random.Random(seed)
+    tracker: InvestmentTracker = InvestmentTracker()
+    names: List[str] = ["Property {}".format(index) for index in range(28)]
+
+    def work() -> int:
+        for turn in range(2000):
+            name: str = rng.choice(names)
+            if turn % 10 == 0 or tracker.find_active(name) is None:
+                tracker.track_property(name, rng.choice(DEFAULT_PLAYERS), turn, 200)
+            else:
+                tracker.rent_collected(name, rng.choice(DEFAULT_PLAYERS), rng.randrange(2, 2000))
+        return 2000
+
+    return work
+
+
+def bench_turn_records(seed: int) -> Callable[[], int]:
+    rng: random.Random = random.Random(seed)
+    history: List[TurnHistoryRecord] = []
+
+    def work() -> int:
+        # Filled in the way run_next_turn fills them in, and kept alive like Player.turn_history
+        for turn_number in range(10000):
+            turn: TurnHistoryRecord = TurnHistoryRecord()
+            turn.turn_number = turn_number
+            turn.dice_roll1 = rng.randrange(1, 7)
+            turn.dice_roll2 = rng.randrange(1, 7)
+            turn.origin = rng.randrange(0, 40)
+            turn.destination = (turn.origin + turn.dice_roll1 + turn.dice_roll2) % 40
+            turn.initial_balance = rng.randrange(-500, 5000)
+            turn.recent_balance = turn.initial_balance - rng.randrange(0, 500)
+            if rng.random() < 0.05:
+                turn.new_properties.append("Boardwalk")
+            history.append(turn)
+        return 10000
+
+    return work
+
+
+def bench_logger_save(seed: int) -> Callable[[], int]:
+    game: MonopolyGame = MonopolyGame(players=DEFAULT_PLAYERS, seed=seed, logger=Logger(capacity=2000))
+    while len(game.players) > 1 and len(game.logger.logs) < 2000:
+        game.run_next_turn()
+    handle, filename = tempfile.mkstemp(suffix=".html")
+    os.close(handle)
+
+    def work() -> int:
+        with redirect_stdout(io.StringIO()):
+            game.logger.save(filename)
+        os.remove(filename)
+        return 1
+
+    return work
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("MonopolyGame.run_next_turn", "turn", bench_turns),
+    Benchmark("MonopolyGame (complete game)", "game", bench_games),
+    Benchmark("MonopolyGame.fork", "fork", bench_fork),
+    Benchmark("MonopolyGame.restore", "restore", bench_restore),
+    Benchmark("RolloutPlanner.houses_to_build", "decision", bench_rollouts),
+    Benchmark("MonopolyGame.build_houses", "call", bench_build_houses),
+    Benchmark("TradeBroker.attempt_all_trades", "call", bench_trades),
+    Benchmark("PropertyManager.class_*", "call", bench_classify),
+    Benchmark("InvestmentTracker", "record", bench_tracker),
+    Benchmark("TurnHistoryRecord", "record", bench_turn_records),
+    Benchmark("Logger.save", "save", bench_logger_save)
+]
+
+
+def run_benchmarks(**kwargs) -> List[BenchmarkResult]:
+    """
+    Run the benchmark suite
+
+    :param kwargs:
+        seeds=int: The number of (fixed) seeds to run each benchmark with (default 5)
+        only=List[str]: Only run benchmarks whose name contains one of these strings
+    :return: The measurements of each benchmark
+    """
+    seeds: List[int] = list(range(kwargs["seeds"] if "seeds" in kwargs else 5))
+    only: List[str] = kwargs["only"] if "only" in kwargs else []
+    return [benchmark.run(seeds) for benchmark in BENCHMARKS
+            if not only or any([pattern in benchmark.name for pattern in only])]
+
+
+def compare(results: List[BenchmarkResult], baseline: Dict[str, Dict[str, Union[str, int, float]]],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Compare results against a stored baseline
+
+    :param results: The measurements to check
+    :param baseline: Stored results, keyed by benchmark name
+    :param tolerance: How many times slower than the baseline a benchmark may be
+    :return: A description of every regression (empty if there are none)
+    """
+    regressions: List[str] = []
+    for result in results:
+        if result.name not in baseline or result.throughput() == 0:
+            continue
+        slowdown: float = float(baseline[result.name]["throughput"]) / result.throughput()
+        if slowdown > tolerance:
+            regressions.append("{} is {:.2f}x slower than the baseline ({:.1f} vs {:.1f} {}s/sec)".format(
+                result.name, slowdown, result.throughput(), baseline[result.name]["throughput"], result.unit))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the throughput of the engine's hot paths")
+    parser.add_argument("--seeds", type=int, default=5, help="the number of fixed seeds per benchmark")
+    parser.add_argument("--only", nargs="*", default=[], help="only run benchmarks matching these names")
+    parser.add_argument("--save", help="store the results as a baseline in this JSON file")
+    parser.add_argument("--compare", help="compare the results against a baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="fail if a benchmark is this many times slower than the baseline")
+    args = parser.parse_args()
+
+    benchmark_results: List[BenchmarkResult] = run_benchmarks(seeds=args.seeds, only=args.only)
+    for benchmark_result in benchmark_results:
+        print(benchmark_result)
+
+    if args.save:
+        with open(args.save, "w") as fp:
+            json.dump({result.name: result.to_dict() for result in benchmark_results}, fp, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as fp:
+            found: List[str] = compare(benchmark_results, json.load(fp), args.tolerance)
+        for regression in found:
+            print(regression)
+        sys.exit(1 if found else 0)
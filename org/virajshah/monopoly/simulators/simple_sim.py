@@ -1,5 +1,4 @@
 from org.virajshah.monopoly.core import MonopolyGame, Player
-from org.virajshah.monopoly.logger import Logger
 
 if __name__ == "__main__":
     game: MonopolyGame = MonopolyGame()
@@ -12,6 +11,6 @@ if __name__ == "__main__":
     while len(game.players) > 1:
         game.run_next_turn()
 
-    Logger.log(str(game.investment_tracker))
-    Logger.save("/tmp/monopolysimpy-lastrun.html")
+    game.logger.log(str(game.investment_tracker))
+    game.logger.save("/tmp/monopolysimpy-lastrun.html")
     game.investment_tracker.generate_html_table("/tmp/investment-tracker.html")
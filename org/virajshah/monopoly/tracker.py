@@ -1,4 +1,4 @@
-from typing import Union, List, IO
+from typing import Dict, Union, List, IO
 
 from org.virajshah.monopoly.html import DOMElement
 from org.virajshah.monopoly.records import InvestmentRecord, TransactionRecord
@@ -7,6 +7,7 @@ from org.virajshah.monopoly.records import InvestmentRecord, TransactionRecord
 class InvestmentTracker:
     def __init__(self):
         self.ledger: List[InvestmentRecord] = []
+        self.active: Dict[str, InvestmentRecord] = {}  # The ACTIVE record of each property, by property name
 
     def track_property(self, prop_name: str, owner: str, turn: int, price: int) -> None:
         """
@@ -26,12 +27,12 @@ class InvestmentTracker:
         record.purchased_price = price
         record.status = "ACTIVE"
 
-        active_record: InvestmentRecord = self.find_active(prop_name)
-        while active_record is not None:
+        active_record: Union[InvestmentRecord, None] = self.active.get(prop_name)
+        if active_record is not None:
             active_record.status = "INACTIVE"
-            active_record = self.find_active(prop_name)
 
         self.ledger.append(record)
+        self.active[prop_name] = record
 
     def find_active(self, prop_name: str) -> Union[InvestmentRecord, None]:
         """
@@ -41,10 +42,7 @@ class InvestmentTracker:
             information about a tracked property.
             **RETURNS None if no property could be found**
         """
-        for record in self.ledger:
-            if record.property == prop_name and record.status == "ACTIVE":
-                return record
-        return None
+        return self.active.get(prop_name)
 
     def rent_collected(self, prop_name, payer, amount) -> None:
         """
@@ -56,13 +54,14 @@ class InvestmentTracker:
         :return: None
         """
 
-        record: InvestmentRecord = self.find_active(prop_name)
+        record: Union[InvestmentRecord, None] = self.active.get(prop_name)
         if record is not None:
             transaction: TransactionRecord = TransactionRecord()
             transaction.payer = payer
             transaction.recipient = record.owner
             transaction.amount = amount
             record.transactions.append(transaction)
+            record.rent_collected += amount
         else:
             raise IndexError("No active record for '{}' could be found".format(prop_name))
 
@@ -89,9 +88,7 @@ class InvestmentTracker:
             tr.append_child(DOMElement("td", children=[record.owner]))
             tr.append_child(DOMElement("td", children=[record.purchased_turn]))
             tr.append_child(DOMElement("td", children=[record.purchased_price]))
-            tr.append_child(DOMElement("td", children=[str(
-                sum([transaction.amount for transaction in record.transactions]) - record.purchased_price
-            )]))
+            tr.append_child(DOMElement("td", children=[str(record.rent_collected - record.purchased_price)]))
             tr.append_child(DOMElement("td", children=[
                 DOMElement("b", children=["ACTIVE"]) if record.status == "ACTIVE" else record.status
             ]))
@@ -108,7 +105,8 @@ class InvestmentTracker:
         ])
 
         fp: IO = open(filename, "w")
-        fp.write("<!DOCTYPE html>" + str(document))
+        fp.write("<!DOCTYPE html>")
+        document.render_to(fp)
         fp.close()
 
     def __str__(self):
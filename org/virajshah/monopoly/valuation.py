@@ -0,0 +1,146 @@
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+from org.virajshah.monopoly.core import BOARD_TABLES, BoardTables, ColoredProperty, DefaultStrategy, MonopolyGame, \
+    Player, Property
+
+MAX_HOUSES: int = 5
+ROW: int = MAX_HOUSES + 1  # Entries per tile (or set) in each table
+
+
+class ExpectedValueTable:
+    def __init__(self, landing: Sequence[float]):
+        """
+        Expected rent per opponent turn for every (property, houses, owned
+        in set) state, derived from landing probabilities. Every lookup is
+        a single index into a flat tuple, so it is cheap enough for the
+        turn loop.
+
+        :param landing: The probability that an opponent's turn lands on each board index
+        """
+        tables: BoardTables = BOARD_TABLES
+        self.landing: Tuple[float, ...] = tuple(landing)
+        rents: List[float] = [0.0] * (tables.size * ROW)
+        build_returns: List[float] = [0.0] * (tables.size * ROW)
+        set_rents: List[float] = [0.0] * (len(tables.set_id_sizes) * ROW)
+
+        for tile in tables.property_tiles:
+            row: int = tile * ROW
+            for houses in range(ROW):
+                rents[row + houses] = self.landing[tile] * tables.rents[tile][houses]
+                set_rents[tables.set_of[tile] * ROW + houses] += rents[row + houses]
+            for houses in range(MAX_HOUSES):
+                build_returns[row + houses] = (rents[row + houses + 1] - rents[row + houses]) / tables.house_costs[tile]
+
+        # purchase_values[tile * ROW + owned]: The rent gained by buying a tile while owning `owned` of its set.
+        # Completing a set adds the return of building one house on each of its properties.
+        purchase_values: List[float] = [0.0] * (tables.size * ROW)
+        for tile in tables.property_tiles:
+            set_id: int = tables.set_of[tile]
+            for owned in range(tables.set_id_sizes[set_id]):
+                value: float = rents[tile * ROW]
+                if owned + 1 == tables.set_id_sizes[set_id]:
+                    value += set_rents[set_id * ROW + 1] - set_rents[set_id * ROW]
+                purchase_values[tile * ROW + owned] = value
+
+        self.rents: Tuple[float, ...] = tuple(rents)
+        self.build_returns: Tuple[float, ...] = tuple(build_returns)
+        self.set_rents: Tuple[float, ...] = tuple(set_rents)
+        self.purchase_values: Tuple[float, ...] = tuple(purchase_values)
+
+    def rent(self, tile: int, houses: int) -> float:
+        """
+        :param tile: The board index of the property
+        :param houses: The number of houses on the property (5 = hotel)
+        :return: The expected rent collected per opponent turn
+        """
+        return self.rents[tile * ROW + houses]
+
+    def build_return(self, tile: int, houses: int) -> float:
+        """
+        :param tile: The board index of the property
+        :param houses: The number of houses currently on the property
+        :return: The expected rent per opponent turn gained per dollar spent
+            on the next house (0 if the property has a hotel)
+        """
+        return self.build_returns[tile * ROW + houses]
+
+    def purchase_value(self, tile: int, owned: int) -> float:
+        """
+        :param tile: The board index of the property
+        :param owned: The number of other properties in its set the buyer owns
+        :return: The expected rent per opponent turn gained by buying the property
+        """
+        return self.purchase_values[tile * ROW + owned]
+
+    def payback_turns(self, tile: int, owned: int, opponents: int) -> float:
+        """
+        :param tile: The board index of the property
+        :param owned: The number of other properties in its set the buyer owns
+        :param opponents: The number of opponents left in the game
+        :return: The expected number of rounds (one turn per opponent)
+            needed for the property to pay for itself
+        """
+        value: float = self.purchase_values[tile * ROW + owned] * opponents
+        return BOARD_TABLES.prices[tile] / value if value > 0 else float("inf")
+
+
+class PaybackStrategy(DefaultStrategy):
+    def __init__(self, table: ExpectedValueTable, payback_rounds: float):
+        """
+        Buy only the properties expected to pay for themselves within a
+        number of rounds (every decision is precompiled into a lookup
+        table), and build first where the next house returns the most rent
+        per dollar. Other decisions are the player's configured defaults.
+
+        :param table: The expected values to decide by
+        :param payback_rounds: The most rounds a property may take to pay for itself
+        """
+        self.table: ExpectedValueTable = table
+        self.payback_rounds: float = payback_rounds
+        # buy_tables[opponents][tile * ROW + owned]: Whether to buy a tile while owning `owned` of its set
+        self.buy_tables: Dict[int, Tuple[bool, ...]] = {}
+
+    def buy_table(self, opponents: int) -> Tuple[bool, ...]:
+        """
+        :param opponents: The number of opponents left in the game
+        :return: The buying decisions against that many opponents (compiled on first use)
+        """
+        decisions: Tuple[bool, ...] = self.buy_tables.get(opponents, ())
+        if not decisions:
+            tables: BoardTables = BOARD_TABLES
+            decisions = tuple([tables.purchasable[tile] and owned < tables.set_id_sizes[tables.set_of[tile]] and
+                               self.table.payback_turns(tile, owned, opponents) <= self.payback_rounds
+                               for tile in range(tables.size) for owned in range(ROW)])
+            self.buy_tables[opponents] = decisions
+        return decisions
+
+    def compile(self, game: MonopolyGame, player: Player) -> None:
+        for opponents in range(len(game.players)):
+            self.buy_table(opponents)
+
+    def on_land_unowned(self, game: MonopolyGame, player: Player, prop: Property) -> bool:
+        return player.balance - prop.price >= player.configuration.insurance_amount(game) and \
+               self.buy_table(len(game.players) - 1)[prop.index * ROW + player.set_index.owned(prop.set_attribute)]
+
+    def on_build_phase(self, game: MonopolyGame, player: Player) -> None:
+        MonopolyGame.build_houses(player, priority=self.build_priority)
+
+    def build_priority(self, prop: ColoredProperty) -> float:
+        """
+        :param prop: A property the player can build on
+        :return: The expected rent per dollar of the next house on it
+        """
+        return self.table.build_return(prop.index, prop.houses)
+
+
+@lru_cache(maxsize=None)
+def expected_value_table(imprison: bool = False) -> ExpectedValueTable:
+    """
+    :param imprison: Model GO_TO_JAIL as imprisonment (see markov.BoardChain)
+    :return: The table for the standard board, built once and shared
+    """
+    # Imported here so that numpy is only needed once a table is actually built
+    from org.virajshah.monopoly.markov import BoardChain
+    return ExpectedValueTable([float(probability) for probability in
+                               BoardChain(imprison=imprison).landing_probabilities()])
@@ -0,0 +1,15 @@
+import unittest
+
+from org.virajshah.monopoly.compact import cross_check
+
+
+class CompactGameTest(unittest.TestCase):
+    def test_matches_monopoly_game(self):
+        for players in (["Player 1", "Player 2"], ["Player {}".format(seat) for seat in range(1, 7)]):
+            for seed in range(3):
+                with self.subTest(players=len(players), seed=seed):
+                    self.assertIsNone(cross_check(seed, players=players))
+
+
+if __name__ == "__main__":
+    unittest.main()
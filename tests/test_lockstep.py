@@ -0,0 +1,19 @@
+import unittest
+
+try:
+    from org.virajshah.monopoly.lockstep import cross_check
+except ImportError:  # lockstep needs numpy, which the rest of the package does not
+    cross_check = None
+
+
+@unittest.skipIf(cross_check is None, "numpy is not installed")
+class LockstepGamesTest(unittest.TestCase):
+    def test_matches_compact_game(self):
+        for players in (["Player 1", "Player 2"], ["Player {}".format(seat) for seat in range(1, 7)]):
+            for seed in range(3):
+                with self.subTest(players=len(players), seed=seed):
+                    self.assertIsNone(cross_check(seed, games=4, players=players))
+
+
+if __name__ == "__main__":
+    unittest.main()
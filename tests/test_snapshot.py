@@ -0,0 +1,57 @@
+import random
+import unittest
+
+from org.virajshah.monopoly.compact import game_state
+from org.virajshah.monopoly.core import ColoredProperty, MonopolyGame
+from org.virajshah.monopoly.logger import DISABLED, Logger
+
+PLAYERS = ["Player 1", "Player 2", "Player 3", "Player 4"]
+
+
+class SnapshotTest(unittest.TestCase):
+    def test_fork_after_bankruptcy_keeps_released_houses(self):
+        game: MonopolyGame = MonopolyGame(players=PLAYERS, seed=129, logger=Logger(level=DISABLED))
+        while len(game.bankrupted_players) == 0 or game.turn_number < 299:
+            game.run_next_turn()
+        released = [tile for tile in game.board
+                    if isinstance(tile, ColoredProperty) and tile.owner is None and tile.houses > 0]
+        self.assertNotEqual(released, [])
+
+        fork: MonopolyGame = game.fork(1)[0]
+        self.assertEqual(game_state(fork), game_state(game))
+        while len(game.players) > 1 and game.turn_number < 1000:
+            game.run_next_turn()
+            fork.run_next_turn()
+            self.assertEqual(game_state(fork), game_state(game), "turn %d" % game.turn_number)
+
+    def test_fork_leaves_other_random_numbers_alone(self):
+        game: MonopolyGame = MonopolyGame(players=PLAYERS, seed=7, logger=Logger(level=DISABLED))
+        for _ in range(50):
+            game.run_next_turn()
+        rng: random.Random = random.Random(3)
+        rng_state: tuple = rng.getstate()
+        global_state: tuple = random.getstate()
+
+        unseeded: MonopolyGame = game.fork(1)[0]
+        MonopolyGame.from_snapshot(game.snapshot(), rng=rng, logger=Logger(level=DISABLED))
+        self.assertEqual(random.getstate(), global_state)
+        self.assertEqual(rng.getstate(), rng_state)
+        self.assertEqual(unseeded.rng.getstate(), game.rng.getstate())
+
+    def test_fork_keeps_game_limits_and_has_its_own_logger(self):
+        game: MonopolyGame = MonopolyGame(players=PLAYERS, seed=11, logger=Logger(level=DISABLED), max_turns=50,
+                                          stalemate_window=40, history_length=5)
+        for _ in range(10):
+            game.run_next_turn()
+
+        forks = game.fork(2)
+        for fork in forks:
+            self.assertEqual((fork.max_turns, fork.stalemate_window, fork.history_length), (50, 40, 5))
+            fork.play()
+            self.assertLessEqual(fork.turn_number, 50)
+        self.assertIsNot(forks[0].logger, forks[1].logger)
+        self.assertIsNone(game.fork(1, max_turns=None)[0].max_turns)
+
+
+if __name__ == "__main__":
+    unittest.main()